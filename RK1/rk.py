@@ -89,15 +89,18 @@ def main():
         print(f"  {item[0]} -> {item[2]}")
 
     print('\nЗадание Д2')
+    # Количество домов и сумма жителей по улицам за один проход
+    residents_by_street = {}
+    for _, residents, street_name in one_to_many:
+        count, total = residents_by_street.get(street_name, (0, 0))
+        residents_by_street[street_name] = (count + 1, total + residents)
+
     res2_unsorted = []
     for s in streets:
-        # Список домов на улице
-        s_houses = list(filter(lambda i: i[2] == s.name, one_to_many))
-        if len(s_houses) > 0:
-            # Количество жителей в домах
-            s_residents = [residents for _, residents, _ in s_houses]
+        if s.name in residents_by_street:
+            count, total = residents_by_street[s.name]
             # Среднее количество жителей
-            avg_residents = sum(s_residents) / len(s_residents)
+            avg_residents = total / count
             res2_unsorted.append((s.name, round(avg_residents, 1)))
 
     res2 = sorted(res2_unsorted, key=itemgetter(1))
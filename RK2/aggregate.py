@@ -0,0 +1,95 @@
+"""
+Потоковая агрегация количества жителей по улицам за один проход
+"""
+
+import heapq
+from operator import itemgetter
+
+
+class ResidentsStats:
+    """Накопленная статистика количества жителей для одной группы"""
+
+    __slots__ = ('count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def add(self, residents):
+        """Учитывает дом с residents жителями"""
+        self.count += 1
+        self.total += residents
+        if self.min is None or residents < self.min:
+            self.min = residents
+        if self.max is None or residents > self.max:
+            self.max = residents
+
+    @property
+    def mean(self):
+        """Среднее количество жителей"""
+        return self.total / self.count
+
+    def __repr__(self):
+        return (f"ResidentsStats(count={self.count}, total={self.total}, "
+                f"min={self.min}, max={self.max})")
+
+
+class ResidentsAggregator:
+    """Группировка количества жителей по ключу (название или id улицы)"""
+
+    def __init__(self):
+        self.groups = {}
+
+    def add(self, key, residents):
+        """Добавляет одно значение в группу key"""
+        stats = self.groups.get(key)
+        if stats is None:
+            stats = self.groups[key] = ResidentsStats()
+        stats.add(residents)
+
+    def add_rows(self, rows):
+        """Добавляет строки соединения (адрес, жители, название улицы)"""
+        for _, residents, street_name in rows:
+            self.add(street_name, residents)
+        return self
+
+    def add_houses(self, houses):
+        """Добавляет объекты House, группируя их по street_id"""
+        for h in houses:
+            self.add(h.street_id, h.residents_count)
+        return self
+
+    def __contains__(self, key):
+        return key in self.groups
+
+    def __getitem__(self, key):
+        return self.groups[key]
+
+    def __len__(self):
+        return len(self.groups)
+
+    def averages(self, ndigits=None):
+        """Список (ключ, среднее) в порядке появления групп"""
+        if ndigits is None:
+            return [(key, stats.mean) for key, stats in self.groups.items()]
+        return [(key, round(stats.mean, ndigits)) for key, stats in self.groups.items()]
+
+    def top_k(self, k, largest=True):
+        """
+        k групп с наибольшим (или наименьшим) средним через кучу,
+        без сортировки всех групп
+        """
+        select = heapq.nlargest if largest else heapq.nsmallest
+        return select(k, self.averages(), key=itemgetter(1))
+
+
+def aggregate_rows(rows):
+    """Статистика жителей по названию улицы за один проход по соединению"""
+    return ResidentsAggregator().add_rows(rows)
+
+
+def aggregate_houses(houses):
+    """Статистика жителей по street_id за один проход по домам"""
+    return ResidentsAggregator().add_houses(houses)
@@ -0,0 +1,126 @@
+"""
+Замеры производительности соединений и заданий на синтетических городах
+
+Время create_one_to_many, create_many_to_many и task1–task3 измеряется
+на городах от 10³ домов и выше. Для каждой пары соседних размеров
+вычисляется показатель роста log(t₂/t₁) / log(n₂/n₁); значения больше
+порога отмечаются как сверхлинейный рост. Результаты выводятся в JSON.
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+
+from city_generator import generate_city
+from houses_streets import (
+    create_one_to_many, create_many_to_many,
+    task1, task2, task3
+)
+
+SIZES = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+HOUSES_PER_STREET = 25
+
+# Показатель роста, выше которого масштабирование считается сверхлинейным
+SUPERLINEAR_THRESHOLD = 1.3
+# Замеры короче этого времени (сек) слишком шумные для оценки роста
+MIN_MEASURED_TIME = 0.005
+
+
+def measure(func, *args, repeat=3):
+    """Лучшее время выполнения функции из repeat запусков и ее результат"""
+    best = None
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start_time
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_size(n_houses, seed=0, repeat=3):
+    """Замеры всех функций для города из n_houses домов"""
+    streets, houses, streets_houses = generate_city(
+        max(1, n_houses // HOUSES_PER_STREET), n_houses, seed=seed
+    )
+    timings = {}
+    timings['create_one_to_many'], one_to_many = measure(
+        create_one_to_many, streets, houses, repeat=repeat)
+    timings['create_many_to_many'], many_to_many = measure(
+        create_many_to_many, streets, houses, streets_houses, repeat=repeat)
+    timings['task1'], _ = measure(task1, one_to_many, repeat=repeat)
+    timings['task2'], _ = measure(task2, one_to_many, streets, repeat=repeat)
+    timings['task3'], _ = measure(task3, many_to_many, streets, repeat=repeat)
+    return {
+        'houses': n_houses,
+        'streets': len(streets),
+        'links': len(streets_houses),
+        'seconds': timings,
+    }
+
+
+def scaling_report(results, threshold=SUPERLINEAR_THRESHOLD):
+    """Показатели роста между соседними размерами и список сверхлинейных функций"""
+    exponents = {}
+    flagged = []
+    for prev, cur in zip(results, results[1:]):
+        size_ratio = math.log(cur['houses'] / prev['houses'])
+        for name, seconds in cur['seconds'].items():
+            prev_seconds = prev['seconds'][name]
+            if prev_seconds < MIN_MEASURED_TIME:
+                continue
+            exponent = math.log(seconds / prev_seconds) / size_ratio
+            exponents.setdefault(name, []).append(
+                {'from': prev['houses'], 'to': cur['houses'], 'exponent': round(exponent, 3)})
+            if exponent > threshold:
+                flagged.append({'function': name, 'from': prev['houses'],
+                                'to': cur['houses'], 'exponent': round(exponent, 3)})
+    return exponents, flagged
+
+
+def main(argv=None):
+    """Запуск набора замеров"""
+    parser = argparse.ArgumentParser(description='Замеры масштабирования соединений и заданий')
+    parser.add_argument('--max-houses', type=int, default=10 ** 5,
+                        help='наибольший размер города (до 10⁷)')
+    parser.add_argument('--seed', type=int, default=0, help='seed генератора')
+    parser.add_argument('--repeat', type=int, default=3, help='количество повторов замера')
+    parser.add_argument('--threshold', type=float, default=SUPERLINEAR_THRESHOLD,
+                        help='порог показателя роста')
+    parser.add_argument('-o', '--output', help='файл для сохранения JSON')
+    args = parser.parse_args(argv)
+
+    results = []
+    for n_houses in SIZES:
+        if n_houses > args.max_houses:
+            break
+        results.append(run_size(n_houses, args.seed, args.repeat))
+        print(f"{n_houses} домов: " + ', '.join(
+            f"{name} {seconds:.4f} с" for name, seconds in results[-1]['seconds'].items()),
+            file=sys.stderr)
+
+    exponents, flagged = scaling_report(results, args.threshold)
+    report = {
+        'threshold': args.threshold,
+        'results': results,
+        'exponents': exponents,
+        'superlinear': flagged,
+    }
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+
+    for item in flagged:
+        print(f"Сверхлинейный рост: {item['function']} "
+              f"({item['from']} → {item['to']} домов, показатель {item['exponent']})",
+              file=sys.stderr)
+    return 1 if flagged else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
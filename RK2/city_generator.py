@@ -0,0 +1,71 @@
+"""
+Генератор синтетических городов для тестов и замеров производительности
+
+Результат детерминирован для заданного seed.
+"""
+
+import random
+
+from houses_streets import Street, House, StreetHouse
+
+STREET_ROOTS = [
+    'Бауманская', 'Авиамоторная', 'Академическая', 'Тверская', 'Садовая',
+    'Лесная', 'Новая', 'Школьная', 'Советская', 'Пушкинская', 'Зеленая',
+    'Центральная', 'Молодежная', 'Полевая', 'Речная', 'Солнечная', 'Ясная',
+    'Енисейская', 'Ивановская', 'Огородная', 'Ухтомская', 'Электродная',
+    'Юбилейная', 'Ферганская', 'Хлебная', 'Цветочная', 'Чистая', 'Дачная',
+    'Гончарная', 'Кленовая', 'Майская', 'Озерная', 'Рябиновая', 'Тихая',
+]
+
+STREET_KINDS = ['улица', 'аллея', 'набережная', 'площадь', 'линия']
+
+
+def street_names(count):
+    """Уникальные названия улиц: корень, тип и при необходимости номер"""
+    names = []
+    number = 1
+    while len(names) < count:
+        for kind in STREET_KINDS:
+            for root in STREET_ROOTS:
+                name = f'{root} {kind}' if number == 1 else f'{number}-я {root} {kind}'
+                names.append(name)
+                if len(names) == count:
+                    return names
+        number += 1
+    return names
+
+
+def generate_city(n_streets, n_houses, corner_ratio=0.1, seed=0,
+                  min_residents=1, max_residents=500):
+    """
+    Создает улицы, дома и связи многие-ко-многим
+
+    Каждый дом стоит на случайной улице; доля corner_ratio домов — угловые,
+    они связаны еще с одной улицей. Возвращает (streets, houses, streets_houses)
+    в том же формате, что и create_test_data.
+    """
+    if n_streets < 1:
+        raise ValueError("Нужна хотя бы одна улица")
+
+    rnd = random.Random(seed)
+    streets = [Street(i, name) for i, name in enumerate(street_names(n_streets), start=1)]
+
+    houses = []
+    streets_houses = []
+    numbers = [0] * n_streets
+    for house_id in range(1, n_houses + 1):
+        street_index = rnd.randrange(n_streets)
+        street = streets[street_index]
+        numbers[street_index] += 1
+
+        houses.append(House(house_id, f'{street.name}, {numbers[street_index]}',
+                            rnd.randint(min_residents, max_residents), street.id))
+        streets_houses.append(StreetHouse(street.id, house_id))
+
+        if n_streets > 1 and rnd.random() < corner_ratio:
+            other = rnd.randrange(n_streets - 1)
+            if other >= street_index:
+                other += 1
+            streets_houses.append(StreetHouse(streets[other].id, house_id))
+
+    return streets, houses, streets_houses
@@ -0,0 +1,307 @@
+"""
+Колоночное хранение улиц, домов и связей
+
+Вместо объекта на каждую строку данные хранятся в типизированных массивах
+(array) с 4-байтовыми элементами, а строки — в общей таблице: байты UTF-8
+в одном буфере и массив смещений. Адрес дома делится по последней запятой
+на начало («Бауманская») и окончание («, 15»); обе части интернируются,
+поэтому на дом приходится два номера строк, а не текст адреса. Колонка
+переходит на 8-байтовые элементы, только если значение не помещается
+в 4 байта. Объекты Street/House создаются только по запросу.
+
+На generate_city(1000, 200000) колонки дома занимают 20 байт против
+176 байт объекта House со строкой адреса (в 8,8 раза меньше), а город
+целиком вместе со связями — около 31 байта на дом против 388 (в 12,5 раза).
+Идентификаторы улиц и домов должны быть уникальными.
+"""
+
+from array import array
+from bisect import bisect_left
+from operator import itemgetter
+
+from houses_streets import Street, House, StreetHouse
+
+# Тип элементов колонок; при переполнении колонка расширяется до 'q'
+COLUMN_TYPE = 'I'
+
+
+def _append(column, value):
+    """Добавляет значение в колонку и возвращает колонку (возможно, расширенную)"""
+    try:
+        column.append(value)
+    except OverflowError:
+        column = array('q', column)
+        column.append(value)
+    return column
+
+
+def split_address(address):
+    """Начало и окончание адреса: 'Бауманская, 15' -> ('Бауманская', ', 15')"""
+    position = address.rfind(',')
+    if position < 0:
+        return address, ''
+    return address[:position], address[position:]
+
+
+class StringTable:
+    """Таблица строк: байты UTF-8 в одном буфере, одинаковые строки хранятся один раз"""
+
+    def __init__(self, strings=()):
+        self._data = bytearray()
+        self._offsets = array(COLUMN_TYPE, [0])
+        self._lookup = {}
+        for s in strings:
+            self.add(s)
+
+    def add(self, s):
+        """Добавляет строку и возвращает ее номер"""
+        if self._lookup is not None:
+            index = self._lookup.get(s)
+            if index is not None:
+                return index
+
+        index = len(self._offsets) - 1
+        self._data += s.encode('utf-8')
+        self._offsets = _append(self._offsets, len(self._data))
+        if self._lookup is not None:
+            self._lookup[s] = index
+        return index
+
+    def drop_lookup(self):
+        """
+        Освобождает словарь поиска одинаковых строк
+
+        После этого новые строки добавляются без проверки на повтор.
+        """
+        self._lookup = None
+
+    def __getitem__(self, index):
+        return self._data[self._offsets[index]:self._offsets[index + 1]].decode('utf-8')
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def length(self, index):
+        """Длина строки в байтах UTF-8"""
+        return self._offsets[index + 1] - self._offsets[index]
+
+    def endswith(self, index, suffix):
+        """Оканчивается ли строка на suffix (байты UTF-8, без декодирования)"""
+        start = self._offsets[index]
+        end = self._offsets[index + 1]
+        return end - start >= len(suffix) and self._data[end - len(suffix):end] == suffix
+
+    def nbytes(self):
+        """Объем буфера и смещений в байтах"""
+        return len(self._data) + self._offsets.itemsize * len(self._offsets)
+
+
+class CityColumns:
+    """Набор данных о городе в виде колонок"""
+
+    def __init__(self):
+        self.strings = StringTable()
+
+        # Улицы
+        self.street_ids = array(COLUMN_TYPE)
+        self.street_names = array(COLUMN_TYPE)
+
+        # Дома; адрес — номера строк его начала и окончания
+        self.house_ids = array(COLUMN_TYPE)
+        self.house_address_heads = array(COLUMN_TYPE)
+        self.house_address_tails = array(COLUMN_TYPE)
+        self.house_residents = array(COLUMN_TYPE)
+        self.house_street_ids = array(COLUMN_TYPE)
+
+        # Связи многие-ко-многим
+        self.link_street_ids = array(COLUMN_TYPE)
+        self.link_house_ids = array(COLUMN_TYPE)
+
+        # Номер строки улицы по идентификатору; для домов вместо словаря
+        # строится отсортированный индекс (id, номер строки) по запросу
+        self._street_rows = {}
+        self._house_index = None
+
+    @classmethod
+    def from_objects(cls, streets, houses, streets_houses=()):
+        """Строит колонки из объектов Street, House и StreetHouse"""
+        dataset = cls()
+        for s in streets:
+            dataset.add_street(s.id, s.name)
+        for h in houses:
+            dataset.add_house(h.id, h.address, h.residents_count, h.street_id)
+        for sh in streets_houses:
+            dataset.add_link(sh.street_id, sh.house_id)
+        dataset.compact()
+        return dataset
+
+    def compact(self):
+        """
+        Освобождает вспомогательные словари, нужные только при загрузке
+
+        Части адресов, добавленные после compact, не интернируются.
+        """
+        self.strings.drop_lookup()
+
+    def add_street(self, id, name):
+        """Добавляет улицу"""
+        if id in self._street_rows:
+            raise ValueError(f"Повторный идентификатор улицы: {id}")
+        self._street_rows[id] = len(self.street_ids)
+        self.street_ids = _append(self.street_ids, id)
+        self.street_names = _append(self.street_names, self.strings.add(name))
+
+    def add_house(self, id, address, residents_count, street_id):
+        """Добавляет дом"""
+        self._house_index = None
+        head, tail = split_address(address)
+        self.house_ids = _append(self.house_ids, id)
+        self.house_address_heads = _append(self.house_address_heads, self.strings.add(head))
+        self.house_address_tails = _append(self.house_address_tails, self.strings.add(tail))
+        self.house_residents = _append(self.house_residents, residents_count)
+        self.house_street_ids = _append(self.house_street_ids, street_id)
+
+    def add_link(self, street_id, house_id):
+        """Добавляет связь улицы и дома"""
+        self.link_street_ids = _append(self.link_street_ids, street_id)
+        self.link_house_ids = _append(self.link_house_ids, house_id)
+
+    def __len__(self):
+        return len(self.house_ids)
+
+    def house_row(self, house_id):
+        """Номер строки дома по идентификатору или None"""
+        if self._house_index is None:
+            rows = sorted(range(len(self.house_ids)), key=self.house_ids.__getitem__)
+            sorted_ids = array('q', (self.house_ids[row] for row in rows))
+            for i in range(1, len(sorted_ids)):
+                if sorted_ids[i] == sorted_ids[i - 1]:
+                    raise ValueError(f"Повторный идентификатор дома: {sorted_ids[i]}")
+            self._house_index = (sorted_ids, array('q', rows))
+
+        sorted_ids, rows = self._house_index
+        i = bisect_left(sorted_ids, house_id)
+        if i < len(sorted_ids) and sorted_ids[i] == house_id:
+            return rows[i]
+        return None
+
+    # ---------- Представления строк по запросу ----------
+
+    def address(self, row):
+        """Адрес дома в строке row"""
+        return (self.strings[self.house_address_heads[row]]
+                + self.strings[self.house_address_tails[row]])
+
+    def street(self, row):
+        """Объект Street для строки row"""
+        return Street(self.street_ids[row], self.strings[self.street_names[row]])
+
+    def house(self, row):
+        """Объект House для строки row"""
+        return House(self.house_ids[row], self.address(row),
+                     self.house_residents[row], self.house_street_ids[row])
+
+    def link(self, row):
+        """Объект StreetHouse для строки row"""
+        return StreetHouse(self.link_street_ids[row], self.link_house_ids[row])
+
+    def streets(self):
+        """Все улицы в виде объектов Street"""
+        return [self.street(row) for row in range(len(self.street_ids))]
+
+    def houses(self):
+        """Все дома в виде объектов House"""
+        return [self.house(row) for row in range(len(self.house_ids))]
+
+    def streets_houses(self):
+        """Все связи в виде объектов StreetHouse"""
+        return [self.link(row) for row in range(len(self.link_street_ids))]
+
+    def nbytes(self):
+        """Объем колонок и таблицы строк в байтах (без словарей индексов)"""
+        columns = (self.street_ids, self.street_names, self.house_ids,
+                   self.house_address_heads, self.house_address_tails,
+                   self.house_residents, self.house_street_ids,
+                   self.link_street_ids, self.link_house_ids)
+        return self.strings.nbytes() + sum(c.itemsize * len(c) for c in columns)
+
+    # ---------- Соединения и задания ----------
+
+    def _house_rows_by_street(self):
+        """Номера строк домов в порядке соединения один-ко-многим"""
+        street_rows = self._street_rows
+        rows = [row for row, street_id in enumerate(self.house_street_ids)
+                if street_id in street_rows]
+        street_ids = self.house_street_ids
+        rows.sort(key=lambda row: street_rows[street_ids[row]])
+        return rows
+
+    def one_to_many(self):
+        """Соединение один-ко-многим в том же формате, что и create_one_to_many"""
+        strings = self.strings
+        return [(self.address(row), self.house_residents[row],
+                 strings[self.street_names[self._street_rows[self.house_street_ids[row]]]])
+                for row in self._house_rows_by_street()]
+
+    def task1(self, suffix='15'):
+        """Задание Д1: дома с адресом, оканчивающимся на suffix"""
+        encoded = suffix.encode('utf-8')
+        strings = self.strings
+        street_rows = self._street_rows
+
+        # Совпадение проверяется один раз на окончание адреса; если окончание
+        # короче suffix, адрес собирается целиком
+        by_tail = {}
+
+        def matches(row):
+            tail = self.house_address_tails[row]
+            result = by_tail.get(tail)
+            if result is None:
+                if strings.length(tail) >= len(encoded):
+                    result = by_tail[tail] = strings.endswith(tail, encoded)
+                else:
+                    return self.address(row).endswith(suffix)
+            return result
+
+        matched = [row for row in range(len(self.house_ids))
+                   if matches(row) and self.house_street_ids[row] in street_rows]
+        matched.sort(key=lambda row: street_rows[self.house_street_ids[row]])
+        return [(self.address(row), self.house_residents[row],
+                 strings[self.street_names[street_rows[self.house_street_ids[row]]]])
+                for row in matched]
+
+    def task2(self):
+        """Задание Д2: улицы со средним количеством жителей"""
+        # Названия улиц декодируются один раз; сумма и количество жителей
+        # по названию накапливаются за один проход по колонкам
+        names = [self.strings[name] for name in self.street_names]
+        street_rows = self._street_rows
+        totals = {}
+        counts = {}
+        for street_id, residents in zip(self.house_street_ids, self.house_residents):
+            row = street_rows.get(street_id)
+            if row is not None:
+                name = names[row]
+                totals[name] = totals.get(name, 0) + residents
+                counts[name] = counts.get(name, 0) + 1
+
+        result_unsorted = [(name, round(totals[name] / counts[name], 1))
+                           for name in names
+                           if name in counts]
+        return sorted(result_unsorted, key=itemgetter(1))
+
+    def task3(self, prefix='А'):
+        """Задание Д3: улицы, начинающиеся с prefix, и дома на них"""
+        names = [self.strings[name] for name in self.street_names]
+        matched = {name: set() for name in names if name.startswith(prefix)}
+
+        for street_id, house_id in zip(self.link_street_ids, self.link_house_ids):
+            street_row = self._street_rows.get(street_id)
+            if street_row is None:
+                continue
+            addresses = matched.get(names[street_row])
+            house_row = self.house_row(house_id) if addresses is not None else None
+            if house_row is not None:
+                addresses.add(self.address(house_row))
+
+        return {name: list(addresses) for name, addresses in matched.items()}
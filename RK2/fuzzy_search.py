@@ -0,0 +1,146 @@
+"""
+Нечеткий поиск по адресам и названиям улиц через индекс триграмм
+
+Строка приводится к нижнему регистру (ё заменяется на е), разбивается на
+слова, и каждое слово, дополненное пробелами, режется на триграммы.
+Для каждой триграммы хранится отсортированный массив номеров элементов.
+Сходство запроса и элемента — коэффициент Жаккара их множеств триграмм.
+"""
+
+import heapq
+import math
+import re
+from array import array
+from collections import Counter
+from bisect import bisect_left
+
+WORD = re.compile(r'\w+')
+
+# Отношение длин списков, начиная с которого совпадения проверяются
+# двоичным поиском по кандидатам, а не полным проходом по списку
+BISECT_RATIO = 16
+
+# Доля элементов, начиная с которой триграмма считается частой
+FREQUENT_SHARE = 0.05
+# В небольших индексах все триграммы порождают кандидатов
+FREQUENT_MIN = 1000
+
+
+def normalize(text):
+    """Слова строки в нижнем регистре, ё заменяется на е"""
+    return WORD.findall(text.casefold().replace('ё', 'е'))
+
+
+def trigrams(text):
+    """Множество триграмм строки"""
+    grams = set()
+    for word in normalize(text):
+        padded = f' {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _contains(posting, number):
+    """Есть ли номер в отсортированном списке"""
+    position = bisect_left(posting, number)
+    return position < len(posting) and posting[position] == number
+
+
+def _upper_bound(shared, size, query_size):
+    """Наибольшее сходство при shared общих триграммах (не больше size)"""
+    shared = min(shared, size)
+    return shared / (query_size + size - shared)
+
+
+class TrigramIndex:
+    """Инвертированный индекс триграмм по строковому ключу элементов"""
+
+    def __init__(self, items=(), key=str):
+        self._key = key
+        self._items = []
+        self._sizes = array('l')
+        self._postings = {}
+        for item in items:
+            self.add(item)
+
+    def __len__(self):
+        return len(self._items)
+
+    def add(self, item):
+        """Добавляет элемент в индекс"""
+        number = len(self._items)
+        grams = trigrams(self._key(item))
+        self._items.append(item)
+        self._sizes.append(len(grams))
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting is None:
+                posting = self._postings[gram] = array('l')
+            # Номера добавляются по возрастанию, поэтому списки отсортированы
+            posting.append(number)
+
+    def search(self, query, limit=10, min_similarity=0.3):
+        """
+        Элементы, похожие на query, по убыванию сходства
+
+        Возвращает список пар (элемент, сходство) длиной не больше limit.
+        """
+        grams = trigrams(query)
+        if not grams or limit <= 0:
+            return []
+
+        n = len(grams)
+        # Триграммы запроса, которых нет в индексе (например, из-за опечатки),
+        # снижают сходство, но кандидатов не дают
+        postings = sorted(filter(None, map(self._postings.get, grams)), key=len)
+
+        # Сходство не больше доли общих триграмм от триграмм запроса, поэтому
+        # кандидат обязан встретиться хотя бы в одном из exact самых редких
+        # списков. Частые триграммы (например, из слов «улица», «переулок»)
+        # кандидатов не порождают, а только уточняют счетчики уже найденных
+        exact = len(postings) - max(1, math.ceil(min_similarity * n)) + 1
+        if exact <= 0:
+            return []
+        frequent = max(FREQUENT_MIN, FREQUENT_SHARE * len(self._items))
+        seed_count = max(1, min(exact, sum(len(posting) <= frequent
+                                           for posting in postings)))
+
+        shared = Counter()
+        for posting in postings[:seed_count]:
+            # Подсчет выполняется Counter.update на уровне C
+            shared.update(posting)
+
+        # Если ни один кандидат из редких списков не достигает min_similarity
+        # даже при совпадении всех остальных триграмм, кандидатов дают и
+        # частые списки
+        sizes = self._sizes
+        if seed_count < exact and not any(
+                _upper_bound(count + len(postings) - seed_count, sizes[number], n) >= min_similarity
+                for number, count in shared.items()):
+            for posting in postings[seed_count:exact]:
+                shared.update(posting)
+            seed_count = exact
+
+        # Кандидаты, которые даже при совпадении всех частых триграмм не
+        # догонят limit-го лучшего по текущим счетчикам, отбрасываются
+        remaining = len(postings) - seed_count
+        if remaining and len(shared) > limit:
+            threshold = max(min_similarity, heapq.nlargest(
+                limit, (count / (n + sizes[number] - count)
+                        for number, count in shared.items()))[-1])
+            shared = Counter({number: count for number, count in shared.items()
+                              if _upper_bound(count + remaining, sizes[number], n) >= threshold})
+
+        for posting in postings[seed_count:]:
+            if len(posting) > BISECT_RATIO * len(shared):
+                found = [number for number in shared if _contains(posting, number)]
+            else:
+                found = shared.keys() & posting
+            for number in found:
+                shared[number] += 1
+
+        scored = ((count / (n + sizes[number] - count), number)
+                  for number, count in shared.items())
+        best = heapq.nlargest(limit, (pair for pair in scored if pair[0] >= min_similarity),
+                              key=lambda pair: (pair[0], -pair[1]))
+        return [(self._items[number], round(score, 3)) for score, number in best]
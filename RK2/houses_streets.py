@@ -1,4 +1,7 @@
-from operator import itemgetter
+from operator import attrgetter, itemgetter
+
+from aggregate import aggregate_rows
+from text_index import IndexedRows, ROW_ADDRESS, ROW_STREET, STREET_NAME
 
 
 class Street:
@@ -78,64 +81,143 @@ def create_test_data():
     return streets, houses, streets_houses
 
 
+def group_by(items, key):
+    """Индекс: значение ключа -> список объектов в исходном порядке"""
+    index = {}
+    for item in items:
+        index.setdefault(key(item), []).append(item)
+    return index
+
+
+def iter_one_to_many(streets, houses, street_filter=None, house_filter=None):
+    """
+    Ленивое соединение один-ко-многим
+
+    street_filter и house_filter — условия, применяемые до соединения,
+    поэтому в индекс попадают только дома подходящих улиц, прошедшие
+    house_filter. Индекс домов по улице строится один раз, соединение
+    выполняется за линейное время.
+    """
+    if street_filter is not None:
+        streets = [s for s in streets if street_filter(s)]
+        street_ids = {s.id for s in streets}
+        houses = (h for h in houses if h.street_id in street_ids)
+    if house_filter is not None:
+        houses = filter(house_filter, houses)
+    houses_by_street = group_by(houses, attrgetter('street_id'))
+    for s in streets:
+        for h in houses_by_street.get(s.id, ()):
+            yield (h.address, h.residents_count, s.name)
+
+
+def iter_many_to_many(streets, houses, streets_houses, street_filter=None, house_filter=None):
+    """
+    Ленивое соединение многие-ко-многим
+
+    Условия применяются до соединения: в памяти держатся только подходящие
+    улицы, их связи и дома, на которые эти связи ссылаются.
+    """
+    if street_filter is not None:
+        streets = [s for s in streets if street_filter(s)]
+    else:
+        streets = list(streets)
+    street_ids = {s.id for s in streets}
+
+    links_by_street = group_by((sh for sh in streets_houses if sh.street_id in street_ids),
+                               attrgetter('street_id'))
+    house_ids = {sh.house_id for links in links_by_street.values() for sh in links}
+    houses_by_id = group_by((h for h in houses
+                             if h.id in house_ids and (house_filter is None or house_filter(h))),
+                            attrgetter('id'))
+
+    for s in streets:
+        for sh in links_by_street.get(s.id, ()):
+            for h in houses_by_id.get(sh.house_id, ()):
+                yield (h.address, h.residents_count, s.name)
+
+
 def create_one_to_many(streets, houses):
     """Создание соединения один-ко-многим"""
-    one_to_many = [(h.address, h.residents_count, s.name)
-                   for s in streets
-                   for h in houses
-                   if h.street_id == s.id]
+    one_to_many = list(iter_one_to_many(streets, houses))
     return one_to_many
 
 
 def create_many_to_many(streets, houses, streets_houses):
     """Создание соединения многие-ко-многим"""
-    many_to_many_temp = [(s.name, sh.street_id, sh.house_id)
-                         for s in streets
-                         for sh in streets_houses
-                         if s.id == sh.street_id]
-
-    many_to_many = [(h.address, h.residents_count, street_name)
-                    for street_name, street_id, house_id in many_to_many_temp
-                    for h in houses if h.id == house_id]
+    many_to_many = list(iter_many_to_many(streets, houses, streets_houses))
     return many_to_many
 
 
-def task1(one_to_many):
-    """Задание Д1: дома с адресом, оканчивающимся на '15'"""
-    result = list(filter(lambda i: i[0].endswith('15'), one_to_many))
+def task1(one_to_many, suffix='15'):
+    """
+    Задание Д1: дома с адресом, оканчивающимся на suffix (по умолчанию '15')
+
+    Для IndexedRows дома ищутся по индексу и идут в порядке индекса.
+    """
+    if isinstance(one_to_many, IndexedRows):
+        return one_to_many.with_suffix(ROW_ADDRESS, suffix)
+    result = list(filter(lambda i: i[0].endswith(suffix), one_to_many))
     return result
 
 
 def task2(one_to_many, streets):
     """Задание Д2: улицы со средним количеством жителей"""
-    result_unsorted = []
-    for s in streets:
-        # Список домов на улице
-        s_houses = list(filter(lambda i: i[2] == s.name, one_to_many))
-        if len(s_houses) > 0:
-            # Количество жителей в домах
-            s_residents = [residents for _, residents, _ in s_houses]
-            # Среднее количество жителей
-            avg_residents = sum(s_residents) / len(s_residents)
-            result_unsorted.append((s.name, round(avg_residents, 1)))
+    # Статистика по всем улицам собирается за один проход по соединению
+    residents = aggregate_rows(one_to_many)
+    result_unsorted = [(s.name, round(residents[s.name].mean, 1))
+                       for s in streets
+                       if s.name in residents]
 
     result = sorted(result_unsorted, key=itemgetter(1))
     return result
 
 
-def task3(many_to_many, streets):
-    """Задание Д3: улицы на 'А' и дома на них"""
+def task2_top(one_to_many, k, largest=True):
+    """Задание Д2: k улиц с наибольшим (наименьшим) средним количеством жителей"""
+    return [(name, round(avg_residents, 1))
+            for name, avg_residents in aggregate_rows(one_to_many).top_k(k, largest)]
+
+
+def task3(many_to_many, streets, prefix='А'):
+    """
+    Задание Д3: улицы на prefix (по умолчанию 'А') и дома на них
+
+    Для IndexedRows улицы ищутся по индексу и идут в порядке названий.
+    """
+    # Улицы и строки соединения с подходящим названием: по индексу, если он есть
+    if isinstance(streets, IndexedRows):
+        matched_streets = streets.with_prefix(STREET_NAME, prefix)
+    else:
+        matched_streets = [s for s in streets if s.name.startswith(prefix)]
+    if isinstance(many_to_many, IndexedRows):
+        matched_rows = many_to_many.with_prefix(ROW_STREET, prefix)
+    else:
+        matched_rows = [row for row in many_to_many if row[2].startswith(prefix)]
+
+    # Адреса домов по названию улицы (убираем дубликаты)
+    addresses_by_street = {}
+    for address, _, street_name in matched_rows:
+        addresses_by_street.setdefault(street_name, set()).add(address)
+
     result = {}
-    for s in streets:
-        if s.name.startswith('А'):
-            # Список домов на улице (многие-ко-многим)
-            s_houses = list(filter(lambda i: i[2] == s.name, many_to_many))
-            # Адреса домов (убираем дубликаты)
-            s_addresses = list(set([address for address, _, _ in s_houses]))
-            result[s.name] = s_addresses
+    for s in matched_streets:
+        result[s.name] = list(addresses_by_street.get(s.name, ()))
     return result
 
 
+def task3_lazy(streets, houses, streets_houses, prefix='А'):
+    """
+    Задание Д3 без построения полного соединения многие-ко-многим
+
+    Улицы отбираются до соединения, поэтому в iter_many_to_many попадают
+    только их связи и дома: память пропорциональна размеру результата,
+    а не всего соединения.
+    """
+    streets = [s for s in streets if s.name.startswith(prefix)]
+    rows = iter_many_to_many(streets, houses, streets_houses)
+    return task3(rows, streets, prefix)
+
+
 def print_results(result1, result2, result3):
     """Вывод результатов в консоль"""
     print('Задание Д1')
@@ -159,8 +241,10 @@ def print_results(result1, result2, result3):
 def main():
     """Основная функция для запуска программы"""
     streets, houses, streets_houses = create_test_data()
-    one_to_many = create_one_to_many(streets, houses)
-    many_to_many = create_many_to_many(streets, houses, streets_houses)
+    # Строки соединений и улицы индексируются для поиска в task1 и task3
+    one_to_many = IndexedRows(create_one_to_many(streets, houses))
+    many_to_many = IndexedRows(create_many_to_many(streets, houses, streets_houses))
+    streets = IndexedRows(streets)
 
     result1 = task1(one_to_many)
     result2 = task2(one_to_many, streets)
@@ -0,0 +1,305 @@
+"""
+Потоковая загрузка улиц, домов и связей из файлов CSV и JSON Lines
+
+Файлы читаются порциями по chunk_size записей. Каждая порция проверяется
+целиком операциями над множествами: повторяющиеся id, ссылки на
+несуществующие улицы и дома, отрицательное число жителей. Построчный
+разбор с точным указанием ошибки выполняется, только если порция не
+прошла проверку. Числовые поля должны быть целыми: значения вроде 1.9
+или "1.5" отклоняются, а не округляются. В памяти кроме самих объектов хранятся лишь множества id,
+поэтому генераторы iter_streets, iter_houses и iter_links можно передавать
+прямо в функции соединений из houses_streets.py.
+
+CSV-файлы должны иметь строку заголовка с именами полей; в JSON Lines
+каждая строка — объект с теми же полями:
+    улицы:  id, name
+    дома:   id, address, residents_count, street_id
+    связи:  street_id, house_id
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from itertools import islice
+from operator import itemgetter
+
+from houses_streets import (
+    Street, House, StreetHouse,
+    create_one_to_many, create_many_to_many
+)
+
+STREET_FIELDS = ('id', 'name')
+HOUSE_FIELDS = ('id', 'address', 'residents_count', 'street_id')
+LINK_FIELDS = ('street_id', 'house_id')
+
+CHUNK_SIZE = 50000
+
+
+class LoadError(ValueError):
+    """Ошибка в данных загружаемого файла"""
+
+
+def _to_int(value):
+    """Целое значение поля; дробные числа и логические значения отклоняются"""
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError(f"нецелое значение {value}")
+    elif isinstance(value, bool):
+        raise TypeError(f"логическое значение {value}")
+    return int(value)
+
+
+def _column_ints(chunk, position):
+    """Список целых значений столбца порции (см. _to_int)"""
+    values = list(map(itemgetter(position), chunk))
+    # Строки CSV и целые JSON преобразуются напрямую, проверка нужна
+    # только для столбцов с float и bool
+    if set(map(type, values)) <= {str, int}:
+        return list(map(int, values))
+    return list(map(_to_int, values))
+
+
+def _read_csv(f, fields, path):
+    reader = csv.reader(f)
+    header = next(reader, None)
+    if header is None:
+        return
+    header = [name.strip() for name in header]
+    missing = [name for name in fields if name not in header]
+    if missing:
+        raise LoadError(f"{path}: в заголовке нет полей {', '.join(missing)}")
+    positions = [header.index(name) for name in fields]
+    for row in reader:
+        if row:
+            try:
+                yield tuple(row[i] for i in positions)
+            except IndexError:
+                yield None
+
+
+def _read_jsonl(f, fields):
+    for line in f:
+        if line.strip():
+            try:
+                record = json.loads(line)
+                yield tuple(record[name] for name in fields)
+            except (ValueError, KeyError, TypeError):
+                yield None
+
+
+def read_chunks(path, fields, chunk_size=CHUNK_SIZE):
+    """
+    Порции записей файла в виде списков кортежей полей
+
+    Формат определяется по расширению: .jsonl и .json — JSON Lines,
+    остальные — CSV. Неразборчивые записи передаются как None.
+    """
+    with open(path, encoding='utf-8', newline='') as f:
+        if path.endswith(('.jsonl', '.json')):
+            records = _read_jsonl(f, fields)
+        else:
+            records = _read_csv(f, fields, path)
+        while True:
+            chunk = list(islice(records, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+
+class CityLoader:
+    """
+    Загрузчик набора данных с проверкой ссылочной целостности
+
+    Улицы нужно загружать раньше домов, а дома — раньше связей.
+    При strict=True первая ошибка вызывает LoadError, иначе ошибочные
+    записи пропускаются и учитываются в stats. progress — функция,
+    вызываемая после каждой порции со словарем stats.
+    """
+
+    def __init__(self, chunk_size=CHUNK_SIZE, strict=True, progress=None):
+        self.chunk_size = chunk_size
+        self.strict = strict
+        self.progress = progress
+        self.street_ids = set()
+        self.house_ids = set()
+        self.stats = {'rows': 0, 'skipped': 0, 'seconds': 0.0, 'rows_per_second': 0.0}
+        self._start_time = None
+
+    def _report(self, rows, skipped):
+        stats = self.stats
+        stats['rows'] += rows
+        stats['skipped'] += skipped
+        stats['seconds'] = time.perf_counter() - self._start_time
+        if stats['seconds'] > 0:
+            stats['rows_per_second'] = stats['rows'] / stats['seconds']
+        if self.progress is not None:
+            self.progress(stats)
+
+    def _reject(self, path, number, reason):
+        if self.strict:
+            raise LoadError(f"{path}, запись {number}: {reason}")
+        return None
+
+    def _load(self, path, fields, check_chunk, check_row, make):
+        """Общий цикл чтения: проверка порции целиком, при ошибке — построчно"""
+        if self._start_time is None:
+            self._start_time = time.perf_counter()
+        number = 0
+        for chunk in read_chunks(path, fields, self.chunk_size):
+            try:
+                columns = check_chunk(chunk)
+            except (ValueError, TypeError):
+                columns = None
+
+            if columns is not None:
+                yield from make(*columns)
+                self._report(len(chunk), 0)
+            else:
+                valid = []
+                for offset, record in enumerate(chunk, start=number + 1):
+                    if record is None:
+                        values = self._reject(path, offset, "запись не разобрана")
+                    else:
+                        try:
+                            values = check_row(path, offset, record)
+                        except LoadError:
+                            raise
+                        except (ValueError, TypeError) as e:
+                            values = self._reject(path, offset, f"неверное значение поля ({e})")
+                    if values is not None:
+                        valid.append(values)
+                if valid:
+                    yield from make(*zip(*valid))
+                self._report(len(valid), len(chunk) - len(valid))
+            number += len(chunk)
+
+    # ---------- Улицы ----------
+
+    def _check_streets(self, chunk):
+        ids = _column_ints(chunk, 0)
+        names = [str(record[1]) for record in chunk]
+        if len(set(ids)) != len(ids) or not self.street_ids.isdisjoint(ids):
+            return None
+        self.street_ids.update(ids)
+        return ids, names
+
+    def _check_street(self, path, number, record):
+        id = _to_int(record[0])
+        if id in self.street_ids:
+            return self._reject(path, number, f"повторяющийся id улицы {id}")
+        self.street_ids.add(id)
+        return id, str(record[1])
+
+    def iter_streets(self, path):
+        """Улицы из файла"""
+        return self._load(path, STREET_FIELDS, self._check_streets, self._check_street,
+                          lambda ids, names: map(Street, ids, names))
+
+    # ---------- Дома ----------
+
+    def _check_houses(self, chunk):
+        ids = _column_ints(chunk, 0)
+        addresses = [str(record[1]) for record in chunk]
+        residents = _column_ints(chunk, 2)
+        street_ids = _column_ints(chunk, 3)
+        if (len(set(ids)) != len(ids) or not self.house_ids.isdisjoint(ids)
+                or min(residents) < 0 or not self.street_ids.issuperset(street_ids)):
+            return None
+        self.house_ids.update(ids)
+        return ids, addresses, residents, street_ids
+
+    def _check_house(self, path, number, record):
+        id, residents, street_id = _to_int(record[0]), _to_int(record[2]), _to_int(record[3])
+        if id in self.house_ids:
+            return self._reject(path, number, f"повторяющийся id дома {id}")
+        if residents < 0:
+            return self._reject(path, number, f"отрицательное число жителей {residents}")
+        if street_id not in self.street_ids:
+            return self._reject(path, number, f"ссылка на неизвестную улицу {street_id}")
+        self.house_ids.add(id)
+        return id, str(record[1]), residents, street_id
+
+    def iter_houses(self, path):
+        """Дома из файла (улицы должны быть уже загружены)"""
+        return self._load(path, HOUSE_FIELDS, self._check_houses, self._check_house,
+                          lambda ids, addresses, residents, street_ids:
+                          map(House, ids, addresses, residents, street_ids))
+
+    # ---------- Связи ----------
+
+    def _check_links(self, chunk):
+        street_ids = _column_ints(chunk, 0)
+        house_ids = _column_ints(chunk, 1)
+        if (not self.street_ids.issuperset(street_ids)
+                or not self.house_ids.issuperset(house_ids)):
+            return None
+        return street_ids, house_ids
+
+    def _check_link(self, path, number, record):
+        street_id, house_id = _to_int(record[0]), _to_int(record[1])
+        if street_id not in self.street_ids:
+            return self._reject(path, number, f"ссылка на неизвестную улицу {street_id}")
+        if house_id not in self.house_ids:
+            return self._reject(path, number, f"ссылка на неизвестный дом {house_id}")
+        return street_id, house_id
+
+    def iter_links(self, path):
+        """Связи улиц и домов из файла (улицы и дома должны быть уже загружены)"""
+        return self._load(path, LINK_FIELDS, self._check_links, self._check_link,
+                          lambda street_ids, house_ids: map(StreetHouse, street_ids, house_ids))
+
+
+def load_city(streets_path, houses_path, links_path=None, chunk_size=CHUNK_SIZE,
+              strict=True, progress=None):
+    """
+    Загружает улицы, дома и связи
+
+    Возвращает (streets, houses, streets_houses, stats) — списки в том же
+    формате, что и create_test_data, и статистику загрузки.
+    """
+    loader = CityLoader(chunk_size, strict, progress)
+    streets = list(loader.iter_streets(streets_path))
+    houses = list(loader.iter_houses(houses_path))
+    streets_houses = list(loader.iter_links(links_path)) if links_path else []
+    return streets, houses, streets_houses, loader.stats
+
+
+def main(argv=None):
+    """Загрузка файлов и построение соединений из командной строки"""
+    parser = argparse.ArgumentParser(description='Загрузка улиц, домов и связей из CSV/JSONL')
+    parser.add_argument('streets', help='файл улиц')
+    parser.add_argument('houses', help='файл домов')
+    parser.add_argument('links', nargs='?', help='файл связей улиц и домов')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                        help='количество записей в порции')
+    parser.add_argument('--skip-invalid', action='store_true',
+                        help='пропускать ошибочные записи вместо остановки')
+    args = parser.parse_args(argv)
+
+    def progress(stats):
+        print(f"\rЗагружено записей: {stats['rows']}, пропущено: {stats['skipped']}, "
+              f"скорость: {stats['rows_per_second']:.0f} записей/сек",
+              end='', file=sys.stderr)
+
+    try:
+        streets, houses, streets_houses, stats = load_city(
+            args.streets, args.houses, args.links, args.chunk_size,
+            not args.skip_invalid, progress)
+    except (OSError, LoadError) as e:
+        print(f"\nОшибка: {e}", file=sys.stderr)
+        return 1
+    print(file=sys.stderr)
+
+    one_to_many = create_one_to_many(streets, houses)
+    many_to_many = create_many_to_many(streets, houses, streets_houses)
+    print(f"Улиц: {len(streets)}, домов: {len(houses)}, связей: {len(streets_houses)}")
+    print(f"Строк один-ко-многим: {len(one_to_many)}, многие-ко-многим: {len(many_to_many)}")
+    print(f"Время загрузки: {stats['seconds']:.2f} сек, "
+          f"скорость: {stats['rows_per_second']:.0f} записей/сек")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""
+Параллельное выполнение заданий Д1–Д3 по диапазонам записей снимка
+
+Данные передаются процессам не списками, а через файл снимка (snapshot.py):
+каждый процесс открывает его через mmap и читает только свой диапазон
+домов и связей. Родитель передает процессам лишь путь и границы
+диапазонов, а получает частичные результаты. Средние Д2 объединяются
+точно — через суммы и количества, поэтому результаты совпадают
+с последовательными функциями.
+
+Д3 выполняется в два прохода: сначала процессы отбирают в своих диапазонах
+связи с улицами на prefix, затем по найденным id возвращают адреса домов
+из своих диапазонов. Между проходами передаются только данные результата.
+"""
+
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from operator import itemgetter
+
+from snapshot import Snapshot, write_snapshot
+
+
+def split_range(count, parts):
+    """Делит 0..count на parts непрерывных диапазонов почти равной длины"""
+    bounds = [count * i // parts for i in range(parts + 1)]
+    return list(zip(bounds, bounds[1:]))
+
+
+def _streets_by_id(snapshot):
+    """Позиции и названия улиц снимка по id"""
+    streets_by_id = {}
+    for pos, s in enumerate(snapshot.streets):
+        streets_by_id.setdefault(s.id, []).append((pos, s.name))
+    return streets_by_id
+
+
+def run_chunk(path, house_range, link_range, suffix='15', prefix='А'):
+    """
+    Первый проход для одного диапазона домов и связей
+
+    Возвращает (строки Д1 с позициями, суммы и количества Д2 по названию
+    улицы, пары (название улицы, id дома) для Д3).
+    """
+    with Snapshot(path) as snapshot:
+        streets_by_id = _streets_by_id(snapshot)
+
+        task1_rows = []
+        task2_totals = {}
+        first, last = house_range
+        for house_pos, h in enumerate(snapshot.houses[first:last], first):
+            for street_pos, name in streets_by_id.get(h.street_id, ()):
+                if h.address.endswith(suffix):
+                    task1_rows.append((street_pos, house_pos, (h.address, h.residents_count, name)))
+                totals = task2_totals.setdefault(name, [0, 0])
+                totals[0] += h.residents_count
+                totals[1] += 1
+
+        task3_links = []
+        for street_id, house_id in snapshot.streets_houses.fields(*link_range):
+            for _, name in streets_by_id.get(street_id, ()):
+                if name.startswith(prefix):
+                    task3_links.append((name, house_id))
+
+    return task1_rows, task2_totals, task3_links
+
+
+def find_addresses(path, house_range, house_ids):
+    """Второй проход: адреса домов диапазона с id из house_ids"""
+    addresses = {}
+    with Snapshot(path) as snapshot:
+        first, last = house_range
+        for pos, fields in enumerate(snapshot.houses.fields(first, last), first):
+            if fields[0] in house_ids:
+                addresses.setdefault(fields[0], []).append(snapshot.houses[pos].address)
+    return addresses
+
+
+def merge_results(streets, partials, addresses):
+    """Объединяет частичные результаты диапазонов в результаты Д1, Д2 и Д3"""
+    task1_rows = []
+    task2_totals = {}
+    task3_addresses = {}
+    for rows, totals, links in partials:
+        task1_rows.extend(rows)
+        for name, (total, number) in totals.items():
+            merged = task2_totals.setdefault(name, [0, 0])
+            merged[0] += total
+            merged[1] += number
+        for name, house_id in links:
+            task3_addresses.setdefault(name, set()).update(addresses.get(house_id, ()))
+
+    # Д1: порядок соединения — позиция улицы, затем позиция дома
+    task1_rows.sort(key=itemgetter(0, 1))
+    result1 = [row for _, _, row in task1_rows]
+
+    result2_unsorted = [(s.name, round(task2_totals[s.name][0] / task2_totals[s.name][1], 1))
+                        for s in streets
+                        if s.name in task2_totals]
+    result2 = sorted(result2_unsorted, key=itemgetter(1))
+
+    result3 = {}
+    for s in streets:
+        if s.name in task3_addresses:
+            result3[s.name] = list(task3_addresses[s.name])
+    return result1, result2, result3
+
+
+def run_snapshot_parallel(path, workers=None, partitions=None, suffix='15', prefix='А'):
+    """
+    Выполняет задания Д1–Д3 над файлом снимка в пуле процессов
+
+    Возвращает (result1, result2, result3) в тех же форматах, что и
+    task1(one_to_many), task2(one_to_many, streets), task3(many_to_many, streets).
+    """
+    workers = workers or os.cpu_count() or 1
+    partitions = partitions or workers
+    with Snapshot(path) as snapshot:
+        streets = list(snapshot.streets)
+        house_ranges = split_range(len(snapshot.houses), partitions)
+        link_ranges = split_range(len(snapshot.streets_houses), partitions)
+
+    paths = [path] * partitions
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext()
+    with pool as executor:
+        run = executor.map if executor is not None else map
+        partials = list(run(run_chunk, paths, house_ranges, link_ranges,
+                            [suffix] * partitions, [prefix] * partitions))
+
+        # Адреса нужны только для домов, связанных с улицами на prefix
+        house_ids = {house_id for _, _, links in partials for _, house_id in links}
+        addresses = {}
+        if house_ids:
+            for part in run(find_addresses, paths, house_ranges, [house_ids] * partitions):
+                for house_id, part_addresses in part.items():
+                    addresses.setdefault(house_id, []).extend(part_addresses)
+
+    return merge_results(streets, partials, addresses)
+
+
+def run_tasks_parallel(streets, houses, streets_houses, workers=None, partitions=None,
+                       suffix='15', prefix='А'):
+    """
+    Выполняет задания Д1–Д3 в пуле процессов
+
+    Данные записываются во временный снимок, который процессы читают
+    по диапазонам (см. run_snapshot_parallel).
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'city.snap')
+        write_snapshot(path, streets, houses, streets_houses)
+        return run_snapshot_parallel(path, workers, partitions, suffix, prefix)
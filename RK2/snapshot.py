@@ -0,0 +1,183 @@
+"""
+Двоичный снимок набора данных о городе с загрузкой через mmap
+
+Формат файла (little-endian):
+    заголовок: сигнатура, версия, количество улиц, домов и связей, размер кучи строк;
+    улицы:     записи (id, смещение названия, длина названия);
+    дома:      записи (id, id улицы, жители, смещение адреса, длина адреса);
+    связи:     записи (id улицы, id дома);
+    куча строк: байты UTF-8 всех названий и адресов.
+Файл открывается через mmap, записи декодируются только при обращении,
+поэтому открытие снимка почти мгновенное. Разделы streets, houses и
+streets_houses — последовательности, которые можно передавать в функции
+соединений и заданий из houses_streets.py.
+"""
+
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from collections.abc import Sequence
+
+from houses_streets import Street, House, StreetHouse
+
+MAGIC = b'CITYSNAP'
+VERSION = 1
+
+HEADER = struct.Struct('<8sIIqqqq')
+STREET_RECORD = struct.Struct('<qqq')
+HOUSE_RECORD = struct.Struct('<qqqqq')
+LINK_RECORD = struct.Struct('<qq')
+
+
+class SnapshotError(ValueError):
+    """Ошибка формата файла снимка"""
+
+
+def write_snapshot(path, streets, houses, streets_houses):
+    """
+    Записывает улицы, дома и связи в файл снимка
+
+    Снимок записывается во временный файл рядом с path и заменяет path
+    только после успешной записи, поэтому прежний снимок не портится.
+    """
+    tmp_path = path + '.tmp'
+    try:
+        _write_snapshot_file(tmp_path, streets, houses, streets_houses)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+
+
+def _write_snapshot_file(path, streets, houses, streets_houses):
+    """Записывает файл снимка по пути path"""
+    with open(path, 'wb') as f, tempfile.TemporaryFile() as heap:
+        heap_size = 0
+
+        def store(text):
+            nonlocal heap_size
+            data = text.encode('utf-8')
+            heap.write(data)
+            heap_size += len(data)
+            return heap_size - len(data), len(data)
+
+        f.write(HEADER.pack(MAGIC, VERSION, 0, 0, 0, 0, 0))
+        counts = [0, 0, 0]
+        for s in streets:
+            f.write(STREET_RECORD.pack(s.id, *store(s.name)))
+            counts[0] += 1
+        for h in houses:
+            f.write(HOUSE_RECORD.pack(h.id, h.street_id, h.residents_count, *store(h.address)))
+            counts[1] += 1
+        for sh in streets_houses:
+            f.write(LINK_RECORD.pack(sh.street_id, sh.house_id))
+            counts[2] += 1
+
+        heap.seek(0)
+        shutil.copyfileobj(heap, f)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, 0, *counts, heap_size))
+
+
+class RecordView(Sequence):
+    """Последовательность записей раздела снимка, декодируемых при обращении"""
+
+    def __init__(self, snapshot, offset, count, record, decode):
+        self._snapshot = snapshot
+        self._offset = offset
+        self._count = count
+        self._record = record
+        self._decode = decode
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('индекс записи вне диапазона')
+        fields = self._record.unpack_from(self._snapshot.data, self._offset + index * self._record.size)
+        return self._decode(fields)
+
+    def fields(self, start=0, stop=None):
+        """Поля записей start..stop без декодирования строк"""
+        stop = self._count if stop is None else min(stop, self._count)
+        unpack_from = self._record.unpack_from
+        data = self._snapshot.data
+        size = self._record.size
+        for offset in range(self._offset + start * size, self._offset + stop * size, size):
+            yield unpack_from(data, offset)
+
+    def __iter__(self):
+        unpack_from = self._record.unpack_from
+        data = self._snapshot.data
+        decode = self._decode
+        for offset in range(self._offset, self._offset + self._count * self._record.size,
+                            self._record.size):
+            yield decode(unpack_from(data, offset))
+
+
+class Snapshot:
+    """Снимок, открытый через mmap"""
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        try:
+            self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise SnapshotError(f"Пустой файл снимка: {path}")
+
+        if len(self.data) < HEADER.size:
+            self.close()
+            raise SnapshotError(f"Файл слишком мал для снимка: {path}")
+        magic, version, _, n_streets, n_houses, n_links, heap_size = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise SnapshotError(f"Неизвестный формат снимка: {path}")
+
+        streets_offset = HEADER.size
+        houses_offset = streets_offset + n_streets * STREET_RECORD.size
+        links_offset = houses_offset + n_houses * HOUSE_RECORD.size
+        self._heap_offset = links_offset + n_links * LINK_RECORD.size
+        if self._heap_offset + heap_size != len(self.data):
+            self.close()
+            raise SnapshotError(f"Размер файла не соответствует заголовку: {path}")
+
+        self.streets = RecordView(self, streets_offset, n_streets, STREET_RECORD,
+                                  self._decode_street)
+        self.houses = RecordView(self, houses_offset, n_houses, HOUSE_RECORD,
+                                 self._decode_house)
+        self.streets_houses = RecordView(self, links_offset, n_links, LINK_RECORD,
+                                         lambda fields: StreetHouse(*fields))
+
+    def _text(self, offset, length):
+        start = self._heap_offset + offset
+        return self.data[start:start + length].decode('utf-8')
+
+    def _decode_street(self, fields):
+        id, name_offset, name_length = fields
+        return Street(id, self._text(name_offset, name_length))
+
+    def _decode_house(self, fields):
+        id, street_id, residents_count, address_offset, address_length = fields
+        return House(id, self._text(address_offset, address_length), residents_count, street_id)
+
+    def close(self):
+        """Закрывает отображение и файл"""
+        if getattr(self, 'data', None) is not None:
+            self.data.close()
+            self.data = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,152 @@
+"""
+Хранение улиц, домов и связей в SQLite
+
+Данные загружаются пакетно (executemany в одной транзакции), а задания
+Д1–Д3 выполняются SQL-запросами, так что в Python возвращаются только
+результаты. Порядок строк совпадает с функциями из houses_streets.py.
+"""
+
+import sqlite3
+from operator import itemgetter
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS streets (
+    pos INTEGER PRIMARY KEY,
+    id INTEGER NOT NULL,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS houses (
+    pos INTEGER PRIMARY KEY,
+    id INTEGER NOT NULL,
+    address TEXT NOT NULL,
+    residents_count INTEGER NOT NULL,
+    street_id INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS streets_houses (
+    pos INTEGER PRIMARY KEY,
+    street_id INTEGER NOT NULL,
+    house_id INTEGER NOT NULL
+);
+"""
+
+# Индексы создаются после загрузки: так вставка выполняется быстрее
+INDEXES = """
+CREATE INDEX IF NOT EXISTS streets_id ON streets (id);
+CREATE INDEX IF NOT EXISTS streets_name ON streets (name);
+CREATE INDEX IF NOT EXISTS houses_id ON houses (id);
+CREATE INDEX IF NOT EXISTS houses_street_id ON houses (street_id);
+CREATE INDEX IF NOT EXISTS streets_houses_street_id ON streets_houses (street_id);
+CREATE INDEX IF NOT EXISTS streets_houses_house_id ON streets_houses (house_id);
+"""
+
+
+def prefix_upper_bound(prefix):
+    """Наименьшая строка, большая всех строк с данным префиксом"""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class CityDatabase:
+    """Набор данных о городе в базе SQLite"""
+
+    def __init__(self, path=':memory:'):
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        """Закрывает соединение с базой"""
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def load(self, streets, houses, streets_houses):
+        """
+        Загружает улицы, дома и связи в одной транзакции
+
+        Аргументы могут быть генераторами: строки передаются в executemany
+        по одной и не накапливаются в памяти.
+        """
+        with self.connection:
+            self.connection.executemany(
+                'INSERT INTO streets (id, name) VALUES (?, ?)',
+                ((s.id, s.name) for s in streets))
+            self.connection.executemany(
+                'INSERT INTO houses (id, address, residents_count, street_id) VALUES (?, ?, ?, ?)',
+                ((h.id, h.address, h.residents_count, h.street_id) for h in houses))
+            self.connection.executemany(
+                'INSERT INTO streets_houses (street_id, house_id) VALUES (?, ?)',
+                ((sh.street_id, sh.house_id) for sh in streets_houses))
+        self.connection.executescript(INDEXES)
+        self.connection.execute('ANALYZE')
+        return self
+
+    def counts(self):
+        """Количество улиц, домов и связей"""
+        return tuple(self.connection.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+                     for table in ('streets', 'houses', 'streets_houses'))
+
+    def one_to_many(self):
+        """Соединение один-ко-многим (итератор строк)"""
+        return self.connection.execute(
+            'SELECT h.address, h.residents_count, s.name '
+            'FROM streets s JOIN houses h ON h.street_id = s.id '
+            'ORDER BY s.pos, h.pos')
+
+    def many_to_many(self):
+        """Соединение многие-ко-многим (итератор строк)"""
+        return self.connection.execute(
+            'SELECT h.address, h.residents_count, s.name '
+            'FROM streets s '
+            'JOIN streets_houses sh ON sh.street_id = s.id '
+            'JOIN houses h ON h.id = sh.house_id '
+            'ORDER BY s.pos, sh.pos, h.pos')
+
+    def task1(self, suffix='15'):
+        """Задание Д1: дома с адресом, оканчивающимся на suffix"""
+        if not suffix:
+            return list(self.one_to_many())
+        return self.connection.execute(
+            'SELECT h.address, h.residents_count, s.name '
+            'FROM streets s JOIN houses h ON h.street_id = s.id '
+            'WHERE substr(h.address, -length(:suffix)) = :suffix '
+            'ORDER BY s.pos, h.pos', {'suffix': suffix}).fetchall()
+
+    def task2(self):
+        """Задание Д2: улицы со средним количеством жителей"""
+        # Как и task2 из houses_streets.py, дома группируются по названию улицы
+        rows = self.connection.execute(
+            'WITH by_name AS ('
+            '    SELECT s.name AS name, SUM(h.residents_count) AS total, COUNT(*) AS cnt '
+            '    FROM streets s JOIN houses h ON h.street_id = s.id '
+            '    GROUP BY s.name) '
+            'SELECT s.name, b.total, b.cnt '
+            'FROM streets s JOIN by_name b ON b.name = s.name '
+            'ORDER BY s.pos')
+        result_unsorted = [(name, round(total / cnt, 1)) for name, total, cnt in rows]
+        return sorted(result_unsorted, key=itemgetter(1))
+
+    def task3(self, prefix='А'):
+        """Задание Д3: улицы, начинающиеся с prefix, и дома на них"""
+        if prefix:
+            condition = 's.name >= :low AND s.name < :high'
+            params = {'low': prefix, 'high': prefix_upper_bound(prefix)}
+        else:
+            condition = '1'
+            params = {}
+
+        names = self.connection.execute(
+            f'SELECT s.name FROM streets s WHERE {condition} ORDER BY s.pos', params)
+        result = {name: [] for name, in names}
+
+        rows = self.connection.execute(
+            'SELECT DISTINCT s.name, h.address '
+            'FROM streets s '
+            'JOIN streets_houses sh ON sh.street_id = s.id '
+            'JOIN houses h ON h.id = sh.house_id '
+            f'WHERE {condition}', params)
+        for name, address in rows:
+            result[name].append(address)
+        return result
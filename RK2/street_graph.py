@@ -0,0 +1,223 @@
+"""
+Граф пересечений улиц по связям StreetHouse
+
+Две улицы пересекаются, если у них есть общий (угловой) дом. Смежность
+хранится в формате CSR (массивы indptr, indices, weights), где вес ребра —
+количество общих домов. Изменения связей накапливаются в небольшом
+словаре поправок и периодически вливаются в CSR: пересчитываются только
+строки с поправками, остальные копируются срезами.
+"""
+
+from array import array
+from collections import deque
+
+# Доля поправок от числа ребер, после которой CSR перестраивается
+COMPACT_RATIO = 0.1
+
+
+class StreetGraph:
+    """Граф пересечений улиц"""
+
+    def __init__(self, streets_houses=(), streets=()):
+        # Улицы дома: id дома -> {id улицы: количество связей}
+        self._streets_by_house = {}
+        # Номер вершины по id улицы и обратно
+        self._vertex = {}
+        self._street_ids = []
+        # Поправки к CSR: вершина -> {вершина: изменение веса}
+        self._delta = {}
+        self._delta_size = 0
+        # Id угловых домов (связанных с двумя и более улицами)
+        self._corners = set()
+
+        for s in streets:
+            self._vertex_of(s.id)
+        for sh in streets_houses:
+            self._vertex_of(sh.street_id)
+            house_streets = self._streets_by_house.setdefault(sh.house_id, {})
+            house_streets[sh.street_id] = house_streets.get(sh.street_id, 0) + 1
+        self._corners = {house_id for house_id, house_streets in self._streets_by_house.items()
+                         if len(house_streets) > 1}
+        self._build_csr()
+
+    def _vertex_of(self, street_id):
+        vertex = self._vertex.get(street_id)
+        if vertex is None:
+            vertex = self._vertex[street_id] = len(self._street_ids)
+            self._street_ids.append(street_id)
+        return vertex
+
+    def _build_csr(self):
+        """Строит CSR по текущим связям за O(связей)"""
+        weights = {}
+        for house_streets in self._streets_by_house.values():
+            if len(house_streets) < 2:
+                continue
+            vertices = [self._vertex[street_id] for street_id in house_streets]
+            for u in vertices:
+                for v in vertices:
+                    if u != v:
+                        weights[u, v] = weights.get((u, v), 0) + 1
+
+        n = len(self._street_ids)
+        degree = [0] * (n + 1)
+        for u, _ in weights:
+            degree[u + 1] += 1
+        indptr = array('q', degree)
+        for i in range(n):
+            indptr[i + 1] += indptr[i]
+
+        indices = array('q', bytes(8 * len(weights)))
+        edge_weights = array('q', bytes(8 * len(weights)))
+        fill = array('q', indptr)
+        for (u, v), weight in weights.items():
+            position = fill[u]
+            indices[position] = v
+            edge_weights[position] = weight
+            fill[u] += 1
+
+        self.indptr, self.indices, self.weights = indptr, indices, edge_weights
+        self._delta = {}
+        self._delta_size = 0
+
+    def _merge_delta(self):
+        """Вливает поправки в CSR за O(ребер + вершин) без обхода домов"""
+        n = len(self._street_ids)
+        old_n = len(self.indptr) - 1
+        indptr = array('q', [0])
+        indices = array('q')
+        edge_weights = array('q')
+
+        # Строки без поправок между измененными копируются одним срезом
+        copied = 0
+        for u in sorted(self._delta) + [n]:
+            last = min(u, old_n)
+            if copied < last:
+                start, end = self.indptr[copied], self.indptr[last]
+                shift = len(indices) - start
+                indices.extend(self.indices[start:end])
+                edge_weights.extend(self.weights[start:end])
+                indptr.extend(position + shift for position in self.indptr[copied + 1:last + 1])
+            indptr.extend([len(indices)] * (u - max(copied, last)))
+            if u == n:
+                break
+
+            row = {}
+            if u < old_n:
+                start, end = self.indptr[u], self.indptr[u + 1]
+                row = dict(zip(self.indices[start:end], self.weights[start:end]))
+            for v, change in self._delta[u].items():
+                row[v] = row.get(v, 0) + change
+            for v, weight in row.items():
+                if weight > 0:
+                    indices.append(v)
+                    edge_weights.append(weight)
+            indptr.append(len(indices))
+            copied = u + 1
+
+        self.indptr, self.indices, self.weights = indptr, indices, edge_weights
+        self._delta = {}
+        self._delta_size = 0
+
+    def compact(self):
+        """Вливает накопленные поправки в CSR"""
+        if self._delta_size:
+            self._merge_delta()
+
+    # ---------- Изменения ----------
+
+    def _add_delta(self, u, v, change):
+        row = self._delta.setdefault(u, {})
+        row[v] = row.get(v, 0) + change
+        self._delta_size += 1
+
+    def _change_link(self, street_id, house_id, change):
+        street = self._vertex_of(street_id)
+        house_streets = self._streets_by_house.setdefault(house_id, {})
+        had_street = house_streets.get(street_id, 0) > 0
+
+        house_streets[street_id] = house_streets.get(street_id, 0) + change
+        if house_streets[street_id] <= 0:
+            del house_streets[street_id]
+        has_street = street_id in house_streets
+
+        # Ребра меняются, только если улица появилась у дома или исчезла
+        if had_street != has_street:
+            for other_id in house_streets:
+                if other_id != street_id:
+                    other = self._vertex[other_id]
+                    self._add_delta(street, other, change)
+                    self._add_delta(other, street, change)
+        if len(house_streets) > 1:
+            self._corners.add(house_id)
+        else:
+            self._corners.discard(house_id)
+        if not house_streets:
+            del self._streets_by_house[house_id]
+
+        if self._delta_size > COMPACT_RATIO * max(len(self.indices), 64):
+            self._merge_delta()
+
+    def add_link(self, street_id, house_id):
+        """Учитывает новую связь улицы и дома"""
+        self._change_link(street_id, house_id, 1)
+
+    def remove_link(self, street_id, house_id):
+        """Удаляет связь улицы и дома"""
+        if self._streets_by_house.get(house_id, {}).get(street_id, 0) <= 0:
+            raise KeyError(f"Нет связи улицы {street_id} и дома {house_id}")
+        self._change_link(street_id, house_id, -1)
+
+    # ---------- Запросы ----------
+
+    def _neighbor_vertices(self, u):
+        """Соседние вершины с учетом поправок"""
+        delta = self._delta.get(u)
+        start = self.indptr[u] if u + 1 < len(self.indptr) else 0
+        end = self.indptr[u + 1] if u + 1 < len(self.indptr) else 0
+        if not delta:
+            return self.indices[start:end].tolist()
+
+        weights = dict(zip(self.indices[start:end], self.weights[start:end]))
+        for v, change in delta.items():
+            weights[v] = weights.get(v, 0) + change
+        return [v for v, weight in weights.items() if weight > 0]
+
+    def intersecting(self, street_id):
+        """Улицы, пересекающиеся с улицей street_id"""
+        u = self._vertex.get(street_id)
+        if u is None:
+            return []
+        return [self._street_ids[v] for v in self._neighbor_vertices(u)]
+
+    def corner_houses(self):
+        """Id угловых домов (связанных с двумя и более улицами)"""
+        return list(self._corners)
+
+    def shortest_path(self, from_street_id, to_street_id):
+        """
+        Кратчайшая цепочка пересекающихся улиц (поиск в ширину)
+
+        Возвращает список id улиц от from_street_id до to_street_id
+        или None, если пути нет.
+        """
+        start = self._vertex.get(from_street_id)
+        goal = self._vertex.get(to_street_id)
+        if start is None or goal is None:
+            return None
+
+        previous = {start: None}
+        queue = deque([start])
+        while queue:
+            u = queue.popleft()
+            if u == goal:
+                path = []
+                while u is not None:
+                    path.append(self._street_ids[u])
+                    u = previous[u]
+                return path[::-1]
+            for v in self._neighbor_vertices(u):
+                if v not in previous:
+                    previous[v] = u
+                    queue.append(v)
+        return None
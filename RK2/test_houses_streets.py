@@ -1,11 +1,45 @@
 
 
+import os
+import tempfile
 import unittest
+from operator import attrgetter
 from houses_streets import (
     Street, House, StreetHouse,
     create_test_data, create_one_to_many, create_many_to_many,
-    task1, task2, task3
+    task1, task2, task2_top, task3,
+    iter_one_to_many, iter_many_to_many, task3_lazy
 )
+from aggregate import aggregate_houses, aggregate_rows
+from columnar import CityColumns
+from sqlite_store import CityDatabase
+from text_index import IndexedRows
+from views import CityViews
+from parallel import run_tasks_parallel, run_snapshot_parallel
+from street_graph import StreetGraph
+from fuzzy_search import TrigramIndex
+from loaders import CityLoader, LoadError, load_city
+from snapshot import Snapshot, write_snapshot
+from city_generator import generate_city
+
+
+def nested_one_to_many(streets, houses):
+    """Исходное соединение один-ко-многим вложенными циклами, O(улицы × дома)"""
+    return [(h.address, h.residents_count, s.name)
+            for s in streets
+            for h in houses
+            if h.street_id == s.id]
+
+
+def nested_many_to_many(streets, houses, streets_houses):
+    """Исходное соединение многие-ко-многим вложенными циклами"""
+    many_to_many_temp = [(s.name, sh.street_id, sh.house_id)
+                         for s in streets
+                         for sh in streets_houses
+                         if s.id == sh.street_id]
+    return [(h.address, h.residents_count, street_name)
+            for street_name, street_id, house_id in many_to_many_temp
+            for h in houses if h.id == house_id]
 
 
 class TestHousesStreets(unittest.TestCase):
@@ -146,6 +180,339 @@ class TestHousesStreets(unittest.TestCase):
         self.assertEqual(addresses.count('Авиамоторная, 25'), 2)  # На двух улицах
         self.assertEqual(addresses.count('Авиамоторная, 30'), 2)  # На двух улицах
 
+    # Тест 7: Соединения по индексам совпадают с вложенными циклами
+    def test_joins_match_nested_loops(self):
+        """Тест совпадения соединений с исходной реализацией"""
+        streets, houses, streets_houses = generate_city(30, 360, seed=1)
+        # Улица без домов и связь с несуществующим домом
+        streets.append(Street(999, 'Пустая'))
+        streets_houses.append(StreetHouse(999, 10 ** 6))
+
+        self.assertEqual(create_one_to_many(streets, houses),
+                         nested_one_to_many(streets, houses))
+        self.assertEqual(create_many_to_many(streets, houses, streets_houses),
+                         nested_many_to_many(streets, houses, streets_houses))
+
+    # Тест 8: Агрегация жителей по улицам за один проход
+    def test_residents_aggregation(self):
+        """Тест статистики жителей и выбора лучших улиц"""
+        stats = aggregate_rows(self.one_to_many)
+        self.assertEqual(stats['Авиамоторная'].count, 2)
+        self.assertEqual(stats['Авиамоторная'].total, 430)
+        self.assertEqual(stats['Академическая'].min, 170)
+        self.assertEqual(stats['Академическая'].max, 190)
+
+        # Группировка по street_id дает те же суммы, что и по соединению
+        by_id = aggregate_houses(self.houses)
+        self.assertEqual(by_id[3].mean, stats['Авиамоторная'].mean)
+
+        # Лучшие улицы совпадают с концом отсортированного task2
+        top = task2_top(self.one_to_many, 2)
+        full = task2(self.one_to_many, self.streets)
+        self.assertEqual(top, full[::-1][:2])
+        self.assertEqual(task2_top(self.one_to_many, 1, largest=False), full[:1])
+
+    # Тест 9: Задания над колоночным хранением
+    def test_columnar_tasks(self):
+        """Тест совпадения заданий над колонками с обычными функциями"""
+        columns = CityColumns.from_objects(self.streets, self.houses, self.streets_houses)
+
+        self.assertEqual(columns.one_to_many(), self.one_to_many)
+        self.assertEqual(columns.task1(), task1(self.one_to_many))
+        self.assertEqual(columns.task2(), task2(self.one_to_many, self.streets))
+
+        expected = task3(self.many_to_many, self.streets)
+        result = columns.task3()
+        self.assertEqual(set(result), set(expected))
+        for street_name, addresses in expected.items():
+            self.assertCountEqual(result[street_name], addresses)
+
+        # Строки восстанавливаются в объекты по запросу
+        self.assertEqual(repr(columns.house(7)), repr(self.houses[7]))
+        self.assertEqual(repr(columns.street(0)), repr(self.streets[0]))
+
+    # Тест 10: Задания в виде SQL-запросов к SQLite
+    def test_sqlite_tasks(self):
+        """Тест совпадения SQL-заданий с обычными функциями"""
+        with CityDatabase() as db:
+            db.load(self.streets, self.houses, self.streets_houses)
+            self.assertEqual(db.counts(), (5, 8, 10))
+
+            self.assertEqual(list(db.many_to_many()), self.many_to_many)
+            self.assertEqual(db.task1(), task1(self.one_to_many))
+            self.assertEqual(db.task2(), task2(self.one_to_many, self.streets))
+
+            expected = task3(self.many_to_many, self.streets)
+            result = db.task3()
+            self.assertEqual(list(result), list(expected))
+            for street_name, addresses in expected.items():
+                self.assertCountEqual(result[street_name], addresses)
+
+    # Тест 11: Поиск по префиксу и суффиксу через индексы
+    def test_indexed_task1_task3(self):
+        """Тест заданий Д1 и Д3 над индексированными строками"""
+        one_to_many = IndexedRows(self.one_to_many)
+        many_to_many = IndexedRows(self.many_to_many)
+        streets = IndexedRows(self.streets)
+
+        # Найденные строки идут в порядке индекса, а не в исходном
+        for suffix in ('15', '5', '0', ''):
+            result = task1(one_to_many, suffix)
+            self.assertCountEqual(result, task1(self.one_to_many, suffix))
+            self.assertEqual([row[0][::-1] for row in result],
+                             sorted(row[0][::-1] for row in result))
+
+        for prefix in ('А', 'Ав', 'Волгоградский', 'Я'):
+            expected = task3(self.many_to_many, self.streets, prefix)
+            result = task3(many_to_many, streets, prefix)
+            self.assertEqual(list(result), sorted(expected))
+            for street_name, addresses in expected.items():
+                self.assertCountEqual(result[street_name], addresses)
+
+        self.assertEqual(list(task3(many_to_many, streets, 'Ав')), ['Авиамоторная'])
+        self.assertEqual(list(streets.text_index(attrgetter('name')).with_prefix('А')), [2, 4, 0])
+
+    # Тест 12: Инкрементальное обновление результатов заданий
+    def test_incremental_views(self):
+        """Тест обновления представлений при изменении данных"""
+        views = CityViews.from_objects(self.streets, self.houses, self.streets_houses)
+        self.assertEqual(views.one_to_many(), self.one_to_many)
+        self.assertEqual(views.task2(), task2(self.one_to_many, self.streets))
+
+        # Новый дом на Бауманской с адресом на '15'
+        views.add_house(House(9, 'Бауманская, 15', 220, 2))
+        self.assertEqual(views.task1(), [('Арбат, 15', 200, 'Арбат'),
+                                         ('Бауманская, 15', 220, 'Бауманская')])
+        self.assertEqual(dict(views.task2())['Бауманская'], 200.0)
+
+        # Изменение количества жителей и удаление дома
+        views.update_house(1, residents_count=250)
+        self.assertEqual(dict(views.task2())['Арбат'], 225.0)
+        views.remove_house(9)
+        self.assertEqual(dict(views.task2())['Бауманская'], 180.0)
+
+        # Удаление связи углового дома и переименование улицы
+        views.remove_link(5, 8)
+        self.assertNotIn('Авиамоторная, 30', views.task3()['Академическая'])
+        views.update_street(2, 'Абрикосовая')
+        self.assertCountEqual(views.task3()['Абрикосовая'], ['Бауманская, 10'])
+
+        # Объекты, переданные в представления, не изменяются
+        self.assertEqual(self.houses[0].residents_count, 150)
+        self.assertEqual(self.streets[1].name, 'Бауманская')
+        self.assertEqual(self.one_to_many, create_one_to_many(self.streets, self.houses))
+
+    # Тест 13: Параллельное выполнение заданий по секциям
+    def test_parallel_tasks(self):
+        """Тест совпадения параллельных заданий с последовательными"""
+        for workers, partitions in ((1, 3), (2, 4)):
+            result1, result2, result3 = run_tasks_parallel(
+                self.streets, self.houses, self.streets_houses,
+                workers=workers, partitions=partitions
+            )
+            self.assertEqual(result1, task1(self.one_to_many))
+            self.assertEqual(result2, task2(self.one_to_many, self.streets))
+
+            expected = task3(self.many_to_many, self.streets)
+            self.assertEqual(list(result3), list(expected))
+            for street_name, addresses in expected.items():
+                self.assertCountEqual(result3[street_name], addresses)
+
+        # Процессы читают свои диапазоны из готового снимка
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'city.snap')
+            write_snapshot(path, self.streets, self.houses, self.streets_houses)
+            result = run_snapshot_parallel(path, workers=2, partitions=5, prefix='Ав')
+            self.assertEqual(result[:2], (task1(self.one_to_many), task2(self.one_to_many, self.streets)))
+            self.assertCountEqual(result[2]['Авиамоторная'],
+                                  task3(self.many_to_many, self.streets, 'Ав')['Авиамоторная'])
+
+    # Тест 14: Детерминированный генератор городов
+    def test_generate_city(self):
+        """Тест генератора синтетических городов"""
+        streets, houses, streets_houses = generate_city(40, 1000, corner_ratio=0.2, seed=7)
+        again = generate_city(40, 1000, corner_ratio=0.2, seed=7)
+
+        self.assertEqual(len(streets), 40)
+        self.assertEqual(len(houses), 1000)
+        self.assertEqual([repr(h) for h in houses], [repr(h) for h in again[1]])
+        self.assertEqual(len({s.name for s in streets}), 40)
+
+        # У каждого дома связь со своей улицей, у угловых — еще одна
+        corner_links = len(streets_houses) - len(houses)
+        self.assertGreater(corner_links, 100)
+        self.assertLess(corner_links, 300)
+        self.assertEqual(len(create_one_to_many(streets, houses)), 1000)
+
+    # Тест 15: Ленивые соединения с условиями
+    def test_lazy_joins_with_filters(self):
+        """Тест ленивых соединений и задания Д3 без полного соединения"""
+        rows = iter_one_to_many(self.streets, self.houses,
+                                house_filter=lambda h: h.address.endswith('15'))
+        self.assertEqual(list(rows), task1(self.one_to_many))
+
+        # house_filter вызывается только для домов подходящих улиц
+        checked = []
+        rows = iter_one_to_many(self.streets, self.houses,
+                                street_filter=lambda s: s.name.startswith('А'),
+                                house_filter=lambda h: checked.append(h.id) or True)
+        self.assertEqual(list(rows), [row for row in self.one_to_many
+                                      if row[2].startswith('А')])
+        self.assertEqual(sorted(checked), [1, 2, 4, 6, 7, 8])
+
+        rows = iter_many_to_many(self.streets, self.houses, self.streets_houses,
+                                 street_filter=lambda s: s.name == 'Академическая')
+        self.assertEqual(list(rows), [row for row in self.many_to_many
+                                      if row[2] == 'Академическая'])
+
+        expected = task3(self.many_to_many, self.streets)
+        result = task3_lazy(self.streets, self.houses, self.streets_houses)
+        self.assertEqual(list(result), list(expected))
+        for street_name, addresses in expected.items():
+            self.assertCountEqual(result[street_name], addresses)
+
+    # Тест 16: Задания над двоичным снимком, открытым через mmap
+    def test_snapshot_roundtrip(self):
+        """Тест записи снимка и выполнения заданий над ним"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'city.snap')
+            write_snapshot(path, self.streets, self.houses, self.streets_houses)
+
+            with Snapshot(path) as snap:
+                self.assertEqual(len(snap.streets), 5)
+                self.assertEqual(len(snap.houses), 8)
+                self.assertEqual(len(snap.streets_houses), 10)
+                self.assertEqual(repr(snap.houses[-1]), repr(self.houses[-1]))
+
+                one_to_many = create_one_to_many(snap.streets, snap.houses)
+                many_to_many = create_many_to_many(snap.streets, snap.houses,
+                                                   snap.streets_houses)
+                self.assertEqual(one_to_many, self.one_to_many)
+                self.assertEqual(many_to_many, self.many_to_many)
+                self.assertEqual(task2(one_to_many, snap.streets),
+                                 task2(self.one_to_many, self.streets))
+
+            # Прерванная запись не портит прежний снимок и не оставляет файлов
+            broken_houses = self.houses + ['не дом']
+            with self.assertRaises(AttributeError):
+                write_snapshot(path, self.streets, broken_houses, self.streets_houses)
+            self.assertEqual(os.listdir(tmp_dir), ['city.snap'])
+            with Snapshot(path) as snap:
+                self.assertEqual(len(snap.houses), 8)
+
+    # Тест 17: Граф пересечений улиц
+    def test_street_graph(self):
+        """Тест пересечений, угловых домов и кратчайшего пути по улицам"""
+        graph = StreetGraph(self.streets_houses, self.streets)
+        self.assertCountEqual(graph.intersecting(3), [4, 5])
+        self.assertCountEqual(graph.corner_houses(), [4, 8])
+        self.assertEqual(graph.shortest_path(4, 5), [4, 3, 5])
+        self.assertIsNone(graph.shortest_path(1, 2))
+
+        # Инкрементальные изменения совпадают с полным перестроением
+        graph.add_link(1, 4)
+        graph.remove_link(5, 8)
+        links = [sh for sh in self.streets_houses if (sh.street_id, sh.house_id) != (5, 8)]
+        links.append(StreetHouse(1, 4))
+        rebuilt = StreetGraph(links, self.streets)
+        for s in self.streets:
+            self.assertCountEqual(graph.intersecting(s.id), rebuilt.intersecting(s.id))
+        self.assertCountEqual(graph.corner_houses(), [4])
+
+        # После вливания поправок CSR совпадает с построенным заново
+        graph.add_link(6, 3)
+        graph.add_link(6, 2)
+        graph.compact()
+        rebuilt = StreetGraph(links + [StreetHouse(6, 3), StreetHouse(6, 2)], self.streets)
+        for s in self.streets:
+            self.assertCountEqual(graph.intersecting(s.id), rebuilt.intersecting(s.id))
+        self.assertCountEqual(graph.intersecting(6), [1, 2])
+        self.assertCountEqual(graph.corner_houses(), [2, 3, 4])
+        self.assertEqual(graph.indptr[-1], len(graph.indices))
+        self.assertEqual(graph.shortest_path(1, 4), [1, 4])
+        self.assertIsNone(graph.shortest_path(1, 5))
+        with self.assertRaises(KeyError):
+            graph.remove_link(5, 8)
+
+    # Тест 18: Нечеткий поиск по адресам и названиям улиц
+    def test_fuzzy_search(self):
+        """Тест поиска адресов с опечатками и без учета регистра"""
+        index = TrigramIndex(self.houses, key=attrgetter('address'))
+        result = index.search('Авиамотор 30', limit=2)
+        self.assertEqual([house.id for house, _ in result], [8, 4])
+        self.assertGreater(result[0][1], result[1][1])
+        self.assertEqual(index.search('АРБАТ, 15', limit=1)[0], (self.houses[1], 1.0))
+        self.assertEqual(index.search('Тверская'), [])
+
+        streets = TrigramIndex(self.streets, key=attrgetter('name'))
+        self.assertEqual(streets.search('волгаградский', limit=1)[0][0].id, 4)
+
+        # Новые дома находятся сразу после добавления
+        index.add(House(9, 'Ёлочная, 3', 100, 6))
+        self.assertEqual(index.search('елочная 3', limit=1)[0][0].id, 9)
+
+        # В большом индексе все верные триграммы запроса с опечаткой частые,
+        # а редкая триграмма опечатки встречается только в постороннем «Кя»
+        addresses = [f'{name} улица, {number}' for name in ('Бауманская', 'Тверская')
+                     for number in range(1, 1501)] + ['Кя']
+        index = TrigramIndex(addresses)
+        self.assertEqual(index.search('Бауманскя улица', limit=1),
+                         [('Бауманская улица, 1', 0.667)])
+        self.assertEqual(index.search('Тверская улицх 7', limit=1)[0][0], 'Тверская улица, 7')
+        self.assertEqual(index.search('Кя', limit=1), [('Кя', 1.0)])
+
+    # Тест 19: Потоковая загрузка из CSV и JSON Lines с проверкой данных
+    def test_loaders(self):
+        """Тест загрузки файлов, проверки ссылок и передачи в соединения"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            streets_path = os.path.join(tmp_dir, 'streets.csv')
+            houses_path = os.path.join(tmp_dir, 'houses.csv')
+            links_path = os.path.join(tmp_dir, 'links.jsonl')
+            with open(streets_path, 'w', encoding='utf-8') as f:
+                f.write('id,name\n')
+                f.writelines(f'{s.id},{s.name}\n' for s in self.streets)
+            with open(houses_path, 'w', encoding='utf-8') as f:
+                f.write('id,address,residents_count,street_id\n')
+                f.writelines(f'{h.id},"{h.address}",{h.residents_count},{h.street_id}\n'
+                             for h in self.houses)
+            with open(links_path, 'w', encoding='utf-8') as f:
+                f.writelines(f'{{"street_id": {sh.street_id}, "house_id": {sh.house_id}}}\n'
+                             for sh in self.streets_houses)
+
+            streets, houses, streets_houses, stats = load_city(
+                streets_path, houses_path, links_path, chunk_size=3)
+            self.assertEqual(stats['rows'], 23)
+            self.assertEqual(create_one_to_many(streets, houses), self.one_to_many)
+            self.assertEqual(create_many_to_many(streets, houses, streets_houses),
+                             self.many_to_many)
+
+            # Генератор домов передается в соединение без промежуточного списка
+            loader = CityLoader()
+            streets = list(loader.iter_streets(streets_path))
+            rows = list(iter_one_to_many(streets, loader.iter_houses(houses_path)))
+            self.assertEqual(rows, self.one_to_many)
+
+            with open(houses_path, 'a', encoding='utf-8') as f:
+                f.write('9,"Арбат, 3",-5,1\n10,"Арбат, 5",10,42\n8,"Арбат, 7",10,1\n')
+            with self.assertRaises(LoadError):
+                load_city(streets_path, houses_path)
+            _, houses, _, stats = load_city(streets_path, houses_path, strict=False)
+            self.assertEqual(len(houses), 8)
+            self.assertEqual(stats['skipped'], 3)
+
+            # Дробные значения отклоняются, а не округляются
+            houses_path = os.path.join(tmp_dir, 'houses.jsonl')
+            with open(houses_path, 'w', encoding='utf-8') as f:
+                f.write('{"id": 1, "address": "Арбат, 1", "residents_count": 150.0, "street_id": 1}\n'
+                        '{"id": 2, "address": "Арбат, 3", "residents_count": 1.9, "street_id": 1}\n'
+                        '{"id": 3, "address": "Арбат, 5", "residents_count": "1.5", "street_id": 1}\n'
+                        '{"id": 4, "address": "Арбат, 7", "residents_count": 10, "street_id": true}\n')
+            with self.assertRaises(LoadError):
+                load_city(streets_path, houses_path)
+            _, houses, _, stats = load_city(streets_path, houses_path, strict=False)
+            self.assertEqual([(h.id, h.residents_count) for h in houses], [(1, 150)])
+            self.assertEqual(stats['skipped'], 3)
+
 
 if __name__ == '__main__':
 
@@ -0,0 +1,81 @@
+"""
+Индексы строк для поиска по префиксу и суффиксу
+
+Ключи хранятся в отсортированном массиве (для суффиксов — перевернутые
+строки), поиск выполняется через bisect за O(log n + k): найденные позиции
+возвращаются в порядке ключей — это готовый срез массива, без сортировки.
+"""
+
+from array import array
+from bisect import bisect_left
+from operator import attrgetter, itemgetter
+
+# Ключи, по которым индексируются строки соединений и улицы
+ROW_ADDRESS = itemgetter(0)
+ROW_STREET = itemgetter(2)
+STREET_NAME = attrgetter('name')
+
+
+def _prefix_range(keys, prefix):
+    """Границы диапазона ключей, начинающихся с prefix"""
+    if not prefix:
+        return 0, len(keys)
+    low = bisect_left(keys, prefix)
+    high = bisect_left(keys, prefix[:-1] + chr(ord(prefix[-1]) + 1), low)
+    return low, high
+
+
+class TextIndex:
+    """Индекс позиций элементов по строковому ключу"""
+
+    def __init__(self, items, key):
+        order = sorted(range(len(items)), key=lambda i: key(items[i]))
+        self._keys = [key(items[i]) for i in order]
+        self._positions = array('q', order)
+        self._reversed = None
+
+    def __len__(self):
+        return len(self._keys)
+
+    def with_prefix(self, prefix):
+        """Позиции элементов, ключ которых начинается с prefix, в порядке ключей"""
+        low, high = _prefix_range(self._keys, prefix)
+        return self._positions[low:high]
+
+    def with_suffix(self, suffix):
+        """Позиции элементов, ключ которых оканчивается на suffix, в порядке перевернутых ключей"""
+        if self._reversed is None:
+            # Индекс перевернутых строк строится при первом поиске по суффиксу
+            order = sorted(range(len(self._keys)), key=lambda i: self._keys[i][::-1])
+            self._reversed = ([self._keys[i][::-1] for i in order],
+                              array('q', (self._positions[i] for i in order)))
+
+        keys, positions = self._reversed
+        low, high = _prefix_range(keys, suffix[::-1])
+        return positions[low:high]
+
+
+class IndexedRows(tuple):
+    """
+    Неизменяемая последовательность строк с индексами по запросу
+
+    Ведет себя как кортеж, поэтому подходит для всех функций заданий;
+    task1 и task3 используют индексы автоматически. Найденные элементы
+    возвращаются в порядке индекса (элементы с равными ключами — в исходном).
+    """
+
+    def text_index(self, key):
+        """Индекс по ключу key (строится один раз и запоминается)"""
+        indexes = self.__dict__.setdefault('_indexes', {})
+        index = indexes.get(key)
+        if index is None:
+            index = indexes[key] = TextIndex(self, key)
+        return index
+
+    def with_prefix(self, key, prefix):
+        """Элементы, ключ которых начинается с prefix, в порядке ключей"""
+        return [self[i] for i in self.text_index(key).with_prefix(prefix)]
+
+    def with_suffix(self, key, suffix):
+        """Элементы, ключ которых оканчивается на suffix, в порядке перевернутых ключей"""
+        return [self[i] for i in self.text_index(key).with_suffix(suffix)]
@@ -0,0 +1,200 @@
+"""
+Инкрементально обновляемые представления для заданий Д1–Д3
+
+Вставка, изменение и удаление улиц, домов и связей обновляют накопленные
+данные за O(1) (для дома — за O(количества его связей)) без пересчета
+соединений: суммы и количество жителей по улицам, множества адресов
+по улицам и дома с адресом на заданный суффикс. Улицы и дома при
+добавлении копируются, поэтому изменения не затрагивают объекты
+вызывающего кода.
+"""
+
+from collections import Counter
+from itertools import count
+from operator import itemgetter
+
+from houses_streets import Street, House
+
+
+class CityViews:
+    """Набор данных о городе с поддерживаемыми результатами заданий"""
+
+    def __init__(self, suffix='15'):
+        self.suffix = suffix
+        self.streets = {}
+        self.houses = {}
+
+        # Дома по улице в порядке добавления и порядковые номера домов
+        self._houses_by_street = {}
+        self._seq = {}
+        self._next_seq = count()
+
+        # Связи: улица -> {дом: кратность}, дом -> {улица: кратность}
+        self._links_by_street = {}
+        self._links_by_house = {}
+
+        # Агрегаты по id улицы
+        self._totals = {}           # [сумма жителей, количество домов]
+        self._addresses = {}        # Counter адресов по связям
+        self._suffix_houses = {}    # {id дома: дом} с адресом на suffix
+
+    @classmethod
+    def from_objects(cls, streets, houses, streets_houses, suffix='15'):
+        """Строит представления из объектов Street, House и StreetHouse"""
+        views = cls(suffix)
+        for s in streets:
+            views.add_street(s)
+        for h in houses:
+            views.add_house(h)
+        for sh in streets_houses:
+            views.add_link(sh.street_id, sh.house_id)
+        return views
+
+    # ---------- Улицы ----------
+
+    def add_street(self, street):
+        """Добавляет улицу"""
+        if street.id in self.streets:
+            raise ValueError(f"Улица {street.id} уже существует")
+        self.streets[street.id] = Street(street.id, street.name)
+
+    def update_street(self, street_id, name):
+        """Переименовывает улицу"""
+        self.streets[street_id].name = name
+
+    def remove_street(self, street_id):
+        """Удаляет улицу (дома и связи остаются, но не попадают в соединения)"""
+        del self.streets[street_id]
+
+    # ---------- Дома ----------
+
+    def _count_house(self, house, sign):
+        """Учитывает дом в агрегатах со знаком sign (+1 или -1)"""
+        totals = self._totals.setdefault(house.street_id, [0, 0])
+        totals[0] += sign * house.residents_count
+        totals[1] += sign
+
+        suffix_houses = self._suffix_houses.setdefault(house.street_id, {})
+        if house.address.endswith(self.suffix):
+            if sign > 0:
+                suffix_houses[house.id] = house
+            else:
+                suffix_houses.pop(house.id, None)
+
+        for street_id, multiplicity in self._links_by_house.get(house.id, {}).items():
+            addresses = self._addresses.setdefault(street_id, Counter())
+            addresses[house.address] += sign * multiplicity
+            if addresses[house.address] <= 0:
+                del addresses[house.address]
+
+    def add_house(self, house):
+        """Добавляет дом"""
+        if house.id in self.houses:
+            raise ValueError(f"Дом {house.id} уже существует")
+        house = House(house.id, house.address, house.residents_count, house.street_id)
+        self.houses[house.id] = house
+        self._houses_by_street.setdefault(house.street_id, {})[house.id] = house
+        self._seq[house.id] = next(self._next_seq)
+        self._count_house(house, 1)
+
+    def update_house(self, house_id, address=None, residents_count=None, street_id=None):
+        """Изменяет адрес, количество жителей и/или улицу дома"""
+        house = self.houses[house_id]
+        self._count_house(house, -1)
+
+        if street_id is not None and street_id != house.street_id:
+            del self._houses_by_street[house.street_id][house_id]
+            self._houses_by_street.setdefault(street_id, {})[house_id] = house
+            self._seq[house_id] = next(self._next_seq)
+            house.street_id = street_id
+        if address is not None:
+            house.address = address
+        if residents_count is not None:
+            house.residents_count = residents_count
+
+        self._count_house(house, 1)
+
+    def remove_house(self, house_id):
+        """Удаляет дом (его связи остаются и снова учитываются при добавлении дома)"""
+        house = self.houses.pop(house_id)
+        self._count_house(house, -1)
+        del self._houses_by_street[house.street_id][house_id]
+        del self._seq[house_id]
+
+    # ---------- Связи ----------
+
+    def _count_link(self, street_id, house_id, sign):
+        house = self.houses.get(house_id)
+        if house is not None:
+            addresses = self._addresses.setdefault(street_id, Counter())
+            addresses[house.address] += sign
+            if addresses[house.address] <= 0:
+                del addresses[house.address]
+
+    def add_link(self, street_id, house_id):
+        """Добавляет связь улицы и дома"""
+        by_street = self._links_by_street.setdefault(street_id, {})
+        by_street[house_id] = by_street.get(house_id, 0) + 1
+        by_house = self._links_by_house.setdefault(house_id, {})
+        by_house[street_id] = by_house.get(street_id, 0) + 1
+        self._count_link(street_id, house_id, 1)
+
+    def remove_link(self, street_id, house_id):
+        """Удаляет одну связь улицы и дома"""
+        by_street = self._links_by_street[street_id]
+        by_house = self._links_by_house[house_id]
+        by_street[house_id] -= 1
+        by_house[street_id] -= 1
+        if not by_street[house_id]:
+            del by_street[house_id]
+            del by_house[street_id]
+        self._count_link(street_id, house_id, -1)
+
+    # ---------- Результаты ----------
+
+    def one_to_many(self):
+        """Соединение один-ко-многим"""
+        return [(h.address, h.residents_count, s.name)
+                for s in self.streets.values()
+                for h in self._houses_by_street.get(s.id, {}).values()]
+
+    def many_to_many(self):
+        """Соединение многие-ко-многим"""
+        return [(self.houses[house_id].address, self.houses[house_id].residents_count, s.name)
+                for s in self.streets.values()
+                for house_id, multiplicity in self._links_by_street.get(s.id, {}).items()
+                if house_id in self.houses
+                for _ in range(multiplicity)]
+
+    def task1(self):
+        """Задание Д1: дома с адресом, оканчивающимся на suffix"""
+        result = []
+        for s in self.streets.values():
+            houses = sorted(self._suffix_houses.get(s.id, {}).values(),
+                            key=lambda h: self._seq[h.id])
+            result.extend((h.address, h.residents_count, s.name) for h in houses)
+        return result
+
+    def task2(self):
+        """Задание Д2: улицы со средним количеством жителей"""
+        # Как и в task2 из houses_streets.py, дома группируются по названию улицы
+        by_name = {}
+        for s in self.streets.values():
+            total, number = self._totals.get(s.id, (0, 0))
+            name_totals = by_name.setdefault(s.name, [0, 0])
+            name_totals[0] += total
+            name_totals[1] += number
+
+        result_unsorted = [(s.name, round(by_name[s.name][0] / by_name[s.name][1], 1))
+                           for s in self.streets.values()
+                           if by_name[s.name][1] > 0]
+        return sorted(result_unsorted, key=itemgetter(1))
+
+    def task3(self, prefix='А'):
+        """Задание Д3: улицы, начинающиеся с prefix, и дома на них"""
+        addresses_by_name = {}
+        for s in self.streets.values():
+            if s.name.startswith(prefix):
+                addresses = addresses_by_name.setdefault(s.name, set())
+                addresses.update(self._addresses.get(s.id, ()))
+        return {name: list(addresses) for name, addresses in addresses_by_name.items()}
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Пакетное (векторизованное) решение биквадратных уравнений Ax⁴ + Bx² + C = 0
+над массивами коэффициентов NumPy
+"""
+
+import numpy as np
+
+# Максимальное количество действительных корней биквадратного уравнения
+MAX_ROOTS = 4
+
+
+def quadratic_y(a, b, c):
+    """
+    Решает уравнения Ay² + By + C = 0 для массивов коэффициентов
+
+    Возвращает (y1, y2, solvable), где solvable — маска уравнений
+    с A != 0 и неотрицательным дискриминантом. При нулевом дискриминанте
+    y1 == y2, как и в solve_biquadratic.
+    """
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    c = np.asarray(c, dtype=np.float64)
+
+    with np.errstate(over='ignore', divide='ignore', invalid='ignore'):
+        # b * b округляется корректно; b ** 2 в solve_biquadratic вызывает
+        # pow() и может отличаться в последнем бите, поэтому значения
+        # корней совпадают с точностью до округления
+        discriminant = b * b - 4 * a * c
+        solvable = (a != 0) & (discriminant >= 0)
+        sqrt_d = np.sqrt(np.where(solvable, discriminant, 0.0))
+        y1 = (-b + sqrt_d) / (2 * a)
+        y2 = (-b - sqrt_d) / (2 * a)
+
+    return y1, y2, solvable
+
+
+def pack_roots(candidates, valid):
+    """
+    Сдвигает действительные корни в начало строк
+
+    candidates — массив (n, k) кандидатов в корни, valid — маска (n, k).
+    Возвращает массив корней (n, k), дополненный NaN, и количество корней.
+    """
+    counts = valid.sum(axis=1)
+    positions = np.cumsum(valid, axis=1) - 1
+    rows = np.broadcast_to(np.arange(valid.shape[0])[:, None], valid.shape)
+
+    roots = np.full(valid.shape, np.nan)
+    roots[rows[valid], positions[valid]] = candidates[valid]
+    return roots, counts
+
+
+def solve_biquadratic_batch(a, b, c):
+    """
+    Решает набор биквадратных уравнений без цикла по уравнениям и без вывода
+
+    Возвращает (roots, counts): roots — массив (n, 4) действительных корней
+    в том же порядке, что и у solve_biquadratic, дополненный NaN;
+    counts — количество корней в каждой строке.
+    """
+    a, b, c = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(a, dtype=np.float64)),
+        np.atleast_1d(np.asarray(b, dtype=np.float64)),
+        np.atleast_1d(np.asarray(c, dtype=np.float64)),
+    )
+    a, b, c = a.ravel(), b.ravel(), c.ravel()
+
+    y1, y2, solvable = quadratic_y(a, b, c)
+
+    with np.errstate(invalid='ignore'):
+        x1 = np.sqrt(np.where(y1 > 0, y1, 0.0))
+        x3 = np.sqrt(np.where(y2 > 0, y2, 0.0))
+
+    # Корни из y₁: ±√y₁ при y₁ > 0 или x = 0 при y₁ == 0
+    y1_pos = solvable & (y1 > 0)
+    y1_zero = solvable & (y1 == 0)
+    # Корни из y₂ добавляются, только если они не совпадают с корнями из y₁
+    y2_pos = solvable & (y2 > 0) & ~(y1_pos & (x3 == x1))
+    y2_zero = solvable & (y2 == 0) & ~y1_zero
+
+    candidates = np.column_stack([
+        np.where(y1_pos, x1, 0.0),
+        -x1,
+        np.where(y2_pos, x3, 0.0),
+        -x3,
+    ])
+    valid = np.column_stack([
+        y1_pos | y1_zero,
+        y1_pos,
+        y2_pos | y2_zero,
+        y2_pos,
+    ])
+
+    return pack_roots(candidates, valid)
+
+
+def roots_to_lists(roots, counts):
+    """Преобразует результат solve_biquadratic_batch в списки корней"""
+    return [row[:count].tolist() for row, count in zip(roots, counts)]
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Кэш корней биквадратных уравнений для повторяющихся коэффициентов
+"""
+
+import json
+import os
+from collections import OrderedDict
+
+from program import solve_biquadratic
+
+DEFAULT_MAXSIZE = 65536
+
+
+class RootCache:
+    """
+    Ограниченный LRU-кэш вокруг solve_biquadratic
+
+    Ключ — нормализованный кортеж коэффициентов. При заданном tolerance
+    коэффициенты округляются до ближайшего кратного tolerance, и уравнение
+    решается для округленных коэффициентов, поэтому близкие тройки
+    получают один и тот же ответ.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, tolerance=None):
+        if maxsize <= 0:
+            raise ValueError("Размер кэша должен быть положительным")
+        if tolerance is not None and tolerance <= 0:
+            raise ValueError("Шаг квантования должен быть положительным")
+
+        self.maxsize = maxsize
+        self.tolerance = tolerance
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def normalize(self, a, b, c):
+        """Нормализованный ключ кэша для коэффициентов"""
+        if self.tolerance is None:
+            # + 0.0 превращает -0.0 в 0.0
+            return (float(a) + 0.0, float(b) + 0.0, float(c) + 0.0)
+        step = self.tolerance
+        return tuple(round(float(x) / step) * step + 0.0 for x in (a, b, c))
+
+    def solve(self, a, b, c):
+        """Возвращает корни уравнения, решая его только при промахе кэша"""
+        key = self.normalize(a, b, c)
+        roots = self._data.get(key)
+        if roots is not None:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return list(roots)
+
+        self.misses += 1
+        roots = tuple(solve_biquadratic(*key, verbose=False))
+        self._data[key] = roots
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+        return list(roots)
+
+    def stats(self):
+        """Статистика попаданий, промахов и вытеснений"""
+        requests = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hit_rate': self.hits / requests if requests else 0.0,
+        }
+
+    def clear(self):
+        """Очищает кэш и статистику"""
+        self._data.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, coefficients):
+        return self.normalize(*coefficients) in self._data
+
+    def save(self, path):
+        """Сохраняет содержимое кэша в JSON-файл (от старых записей к новым)"""
+        data = {
+            'maxsize': self.maxsize,
+            'tolerance': self.tolerance,
+            'entries': [[list(key), list(roots)] for key, roots in self._data.items()],
+        }
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, maxsize=None, tolerance=None, missing_ok=True):
+        """
+        Создает кэш из файла, сохраненного методом save
+
+        Если файла нет и missing_ok=True, возвращается пустой кэш.
+        Явно переданный maxsize имеет приоритет над сохраненным. Если
+        переданный tolerance отличается от сохраненного, записи файла
+        отбрасываются: их корни получены для других округленных
+        коэффициентов.
+        """
+        if missing_ok and not os.path.exists(path):
+            return cls(maxsize or DEFAULT_MAXSIZE, tolerance)
+
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+
+        saved_tolerance = data['tolerance']
+        if tolerance is None:
+            tolerance = saved_tolerance
+        cache = cls(maxsize or data['maxsize'], tolerance)
+        if tolerance != saved_tolerance:
+            return cache
+
+        # Ключи уже нормализованы при сохранении и используются как есть
+        for key, roots in data['entries']:
+            key = tuple(key)
+            cache._data[key] = tuple(roots)
+            cache._data.move_to_end(key)
+            if len(cache._data) > cache.maxsize:
+                cache._data.popitem(last=False)
+        return cache
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Пакетное решение семейств полиномиальных уравнений
+
+Для трехчленов Ax^(2n) + Bx^n + C = 0 используется замена y = xⁿ, как
+в solve_biquadratic. Остальные уравнения решаются через собственные
+значения сопровождающих матриц, вычисляемые для всего пакета сразу.
+Все функции возвращают корни в одинаковом формате: массив (m, k)
+различных действительных корней по возрастанию, дополненный NaN,
+и массив количества корней.
+"""
+
+import numpy as np
+
+from batch import pack_roots, quadratic_y
+
+# Допуск на мнимую часть собственного значения и на совпадение корней
+DEFAULT_TOLERANCE = 1e-7
+
+# Собственные значения корня кратности k расходятся примерно на
+# eps^(1/k) · (1 + |x|); группа объединяется, если разброс не больше
+# CLUSTER_FACTOR таких величин
+CLUSTER_FACTOR = 10.0
+
+
+def _real_nth_root(y, n):
+    """Действительный корень степени n из y (для нечетных n и y < 0 тоже)"""
+    if n == 1:
+        return y
+    if n == 2:
+        return np.sqrt(np.abs(y))
+    root = np.power(np.abs(y), 1.0 / n)
+    return root if n % 2 == 0 else np.sign(y) * root
+
+
+def _sort_packed(roots):
+    """Сортирует корни каждой строки по возрастанию (NaN остаются в конце)"""
+    return np.sort(roots, axis=1)
+
+
+def solve_even_power_batch(a, b, c, n=2):
+    """
+    Решает набор уравнений Ax^(2n) + Bx^n + C = 0
+
+    Возвращает (roots, counts): roots — массив (m, 4) для четных n
+    и (m, 2) для нечетных n.
+    """
+    if n < 1:
+        raise ValueError("Степень n должна быть натуральным числом")
+
+    a, b, c = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(a, dtype=np.float64)),
+        np.atleast_1d(np.asarray(b, dtype=np.float64)),
+        np.atleast_1d(np.asarray(c, dtype=np.float64)),
+    )
+    y1, y2, solvable = quadratic_y(a.ravel(), b.ravel(), c.ravel())
+
+    with np.errstate(invalid='ignore', over='ignore'):
+        x1 = _real_nth_root(np.where(solvable, y1, 0.0), n)
+        x3 = _real_nth_root(np.where(solvable, y2, 0.0), n)
+
+    if n % 2 == 0:
+        # Как в solve_biquadratic: ±ⁿ√y при y > 0, x = 0 при y == 0
+        y1_pos = solvable & (y1 > 0)
+        y1_zero = solvable & (y1 == 0)
+        y2_pos = solvable & (y2 > 0) & ~(y1_pos & (x3 == x1))
+        y2_zero = solvable & (y2 == 0) & ~y1_zero
+
+        candidates = np.column_stack([x1, -x1, x3, -x3])
+        valid = np.column_stack([y1_pos | y1_zero, y1_pos, y2_pos | y2_zero, y2_pos])
+    else:
+        # Для нечетных n каждому y соответствует ровно один действительный x
+        candidates = np.column_stack([x1, x3])
+        valid = np.column_stack([solvable, solvable & (x3 != x1)])
+
+    roots, counts = pack_roots(np.where(valid, candidates, 0.0), valid)
+    return _sort_packed(roots), counts
+
+
+def _dedupe_sorted(roots, tolerance):
+    """Убирает почти совпадающие соседние корни в отсортированных строках"""
+    duplicate = np.zeros(roots.shape, dtype=bool)
+    scale = 1.0 + np.abs(roots[:, 1:])
+    with np.errstate(invalid='ignore'):
+        duplicate[:, 1:] = np.abs(roots[:, 1:] - roots[:, :-1]) <= tolerance * scale
+    valid = ~np.isnan(roots) & ~duplicate
+    return pack_roots(np.where(valid, roots, 0.0), valid)
+
+
+def _derivative_residuals_ok(coefficients, points, order, tolerance):
+    """
+    Проверяет, что производные порядков 0..order-1 обращаются в ноль в точках
+
+    Значение каждой производной сравнивается с ее оценкой по модулям
+    коэффициентов, то есть с величиной ошибки округления при вычислении.
+    """
+    ok = np.ones(len(points), dtype=bool)
+    magnitudes = np.abs(points)
+    for _ in range(order):
+        value = np.zeros(len(points), dtype=np.complex128)
+        bound = np.zeros(len(points))
+        for column in coefficients.T:
+            value = value * points + column
+            bound = bound * magnitudes + np.abs(column)
+        ok &= np.abs(value) <= tolerance * bound
+        degree = coefficients.shape[1] - 1
+        coefficients = coefficients[:, :-1] * np.arange(degree, 0, -1)
+    return ok
+
+
+def _merge_multiple_roots(eigenvalues, coefficients, tolerance):
+    """
+    Заменяет группы собственных значений кратного корня их средним
+
+    Кратный корень сопровождающая матрица возвращает как «облако»
+    из k близких, в том числе комплексных, значений; среднее облака
+    точнее отдельных значений. Группы ищутся от наибольшей кратности
+    к наименьшей: k ближайших свободных значений объединяются, если их
+    разброс допустим для кратности k и в среднем обращаются в ноль
+    многочлен и его производные до порядка k - 1. Объединенные значения,
+    кроме одного, заменяются на NaN.
+    """
+    degree = eigenvalues.shape[1]
+    values = eigenvalues.copy()
+    eps = np.finfo(np.float64).eps
+
+    # Обрабатываются только строки, где есть хотя бы два близких значения
+    distance = np.abs(eigenvalues[:, :, None] - eigenvalues[:, None, :])
+    scale = 1.0 + np.abs(eigenvalues[:, :, None])
+    distance[:, np.arange(degree), np.arange(degree)] = np.inf
+    candidates = np.flatnonzero(np.any(distance <= CLUSTER_FACTOR * eps ** (1.0 / degree) * scale,
+                                       axis=(1, 2)))
+    if not len(candidates):
+        return values
+    distance = distance[candidates]
+    eigenvalues = eigenvalues[candidates]
+    coefficients = coefficients[candidates]
+    cluster_values = values[candidates]
+    free = np.ones((len(candidates), degree), dtype=bool)
+
+    for k in range(degree, 1, -1):
+        radius = CLUSTER_FACTOR * eps ** (1.0 / k)
+        for seed in range(degree):
+            rows = np.flatnonzero(free[:, seed] & (free.sum(axis=1) >= k))
+            if not len(rows):
+                continue
+            seed_distance = np.where(free[rows], distance[rows, seed], np.inf)
+            seed_distance[:, seed] = -1.0
+            nearest = np.argsort(seed_distance, axis=1, kind='stable')[:, :k]
+            members = np.take_along_axis(eigenvalues[rows], nearest, axis=1)
+            center = members.mean(axis=1)
+            spread = np.abs(members - center[:, None]).max(axis=1)
+
+            close = spread <= radius * (1.0 + np.abs(center))
+            if not close.any():
+                continue
+            rows, nearest, center = rows[close], nearest[close], center[close]
+            merge = _derivative_residuals_ok(coefficients[rows], center, k, tolerance)
+            rows, nearest, center = rows[merge], nearest[merge], center[merge]
+
+            free[rows[:, None], nearest] = False
+            cluster_values[rows[:, None], nearest] = np.nan
+            cluster_values[rows, seed] = center
+
+    values[candidates] = cluster_values
+    return values
+
+
+def solve_companion_batch(coefficients, tolerance=DEFAULT_TOLERANCE):
+    """
+    Решает уравнения через собственные значения сопровождающих матриц
+
+    coefficients — массив (m, d + 1) коэффициентов от старшей степени
+    с ненулевым старшим коэффициентом. Кратный корень возвращается один раз.
+    """
+    coefficients = np.asarray(coefficients, dtype=np.float64)
+    m, degree = coefficients.shape[0], coefficients.shape[1] - 1
+
+    companion = np.zeros((m, degree, degree))
+    companion[:, 0, :] = -coefficients[:, 1:] / coefficients[:, :1]
+    if degree > 1:
+        index = np.arange(degree - 1)
+        companion[:, index + 1, index] = 1.0
+
+    eigenvalues = _merge_multiple_roots(np.linalg.eigvals(companion), coefficients, tolerance)
+    is_real = np.abs(eigenvalues.imag) <= tolerance * np.maximum(1.0, np.abs(eigenvalues.real))
+    roots = np.sort(np.where(is_real, eigenvalues.real, np.nan), axis=1)
+    return _dedupe_sorted(roots, tolerance)
+
+
+def trinomial_power(coefficients):
+    """
+    Маска строк вида Ax^(2n) + Bx^n + C и соответствующее n
+
+    Возвращает (mask, n); если степень нечетная, mask — все False.
+    """
+    degree = coefficients.shape[1] - 1
+    if degree % 2:
+        return np.zeros(coefficients.shape[0], dtype=bool), None
+
+    n = degree // 2
+    middle = np.ones(degree + 1, dtype=bool)
+    middle[[0, n, degree]] = False
+    return ~np.any(coefficients[:, middle] != 0, axis=1), n
+
+
+def solve_polynomials(coefficients, tolerance=DEFAULT_TOLERANCE):
+    """
+    Решает набор полиномиальных уравнений одной степени d
+
+    coefficients — массив (m, d + 1) от старшей степени к свободному члену.
+    Трехчлены Ax^(2n) + Bx^n + C решаются в замкнутой форме, остальные —
+    через сопровождающие матрицы. Уравнения с нулевым старшим коэффициентом,
+    как и в solve_biquadratic, не имеют корней.
+    Возвращает (roots, counts): roots — массив (m, d) различных
+    действительных корней по возрастанию, дополненный NaN.
+    """
+    coefficients = np.atleast_2d(np.asarray(coefficients, dtype=np.float64))
+    m, degree = coefficients.shape[0], coefficients.shape[1] - 1
+    if degree < 1:
+        raise ValueError("Степень уравнения должна быть не меньше 1")
+
+    roots = np.full((m, degree), np.nan)
+    counts = np.zeros(m, dtype=np.int64)
+
+    leading = coefficients[:, 0] != 0
+    closed_form, n = trinomial_power(coefficients)
+    closed_form &= leading
+    numeric = leading & ~closed_form
+
+    if closed_form.any():
+        rows = coefficients[closed_form]
+        part_roots, part_counts = solve_even_power_batch(rows[:, 0], rows[:, n], rows[:, -1], n)
+        width = min(degree, part_roots.shape[1])
+        roots[closed_form, :width] = part_roots[:, :width]
+        counts[closed_form] = part_counts
+
+    if numeric.any():
+        part_roots, part_counts = solve_companion_batch(coefficients[numeric], tolerance)
+        roots[numeric] = part_roots
+        counts[numeric] = part_counts
+
+    return roots, counts
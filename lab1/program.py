@@ -38,53 +38,56 @@ def get_coefficient(prompt, default_value=None):
             sys.exit(0)
 
 
-def solve_biquadratic(a, b, c):
+def solve_biquadratic(a, b, c, verbose=True):
+
+    # При verbose=False решение выполняется без вывода на экран
+    log = print if verbose else (lambda *args, **kwargs: None)
 
     # Проверка коэффициента A
     if a == 0:
-        print("Ошибка: коэффициент A не может быть равен 0 для биквадратного уравнения!")
+        log("Ошибка: коэффициент A не может быть равен 0 для биквадратного уравнения!")
         return []
 
     # Вычисляем дискриминант для квадратного уравнения относительно y = x²
     discriminant = b ** 2 - 4 * a * c
 
-    print(f"\nКоэффициенты: A = {a}, B = {b}, C = {c}")
-    print(f"Дискриминант: D = {discriminant}")
+    log(f"\nКоэффициенты: A = {a}, B = {b}, C = {c}")
+    log(f"Дискриминант: D = {discriminant}")
 
     roots = []
 
     if discriminant < 0:
-        print("Уравнение не имеет действительных корней")
+        log("Уравнение не имеет действительных корней")
     elif discriminant == 0:
         # Один корень для y = x²
         y = -b / (2 * a)
-        print(f"y = x² = {y}")
+        log(f"y = x² = {y}")
         if y > 0:
             x1 = math.sqrt(y)
             x2 = -math.sqrt(y)
             roots.extend([x1, x2])
-            print(f"Уравнение имеет два действительных корня: x₁ = {x1:.4f}, x₂ = {x2:.4f}")
+            log(f"Уравнение имеет два действительных корня: x₁ = {x1:.4f}, x₂ = {x2:.4f}")
         elif y == 0:
             roots.append(0)
-            print(f"Уравнение имеет один действительный корень: x = 0")
+            log(f"Уравнение имеет один действительный корень: x = 0")
         else:
-            print("Уравнение не имеет действительных корней")
+            log("Уравнение не имеет действительных корней")
     else:
         # Два корня для y = x²
         y1 = (-b + math.sqrt(discriminant)) / (2 * a)
         y2 = (-b - math.sqrt(discriminant)) / (2 * a)
 
-        print(f"y₁ = x² = {y1:.4f}, y₂ = x² = {y2:.4f}")
+        log(f"y₁ = x² = {y1:.4f}, y₂ = x² = {y2:.4f}")
 
         # Обрабатываем y1
         if y1 > 0:
             x1 = math.sqrt(y1)
             x2 = -math.sqrt(y1)
             roots.extend([x1, x2])
-            print(f"Из y₁ получаем корни: x₁ = {x1:.4f}, x₂ = {x2:.4f}")
+            log(f"Из y₁ получаем корни: x₁ = {x1:.4f}, x₂ = {x2:.4f}")
         elif y1 == 0:
             roots.append(0)
-            print("Из y₁ получаем корень: x = 0")
+            log("Из y₁ получаем корень: x = 0")
 
         # Обрабатываем y2
         if y2 > 0:
@@ -93,16 +96,42 @@ def solve_biquadratic(a, b, c):
             # Проверяем на дубликаты
             if x3 not in roots and -x3 not in roots:
                 roots.extend([x3, x4])
-                print(f"Из y₂ получаем корни: x₃ = {x3:.4f}, x₄ = {x4:.4f}")
+                log(f"Из y₂ получаем корни: x₃ = {x3:.4f}, x₄ = {x4:.4f}")
         elif y2 == 0 and 0 not in roots:
             roots.append(0)
-            print("Из y₂ получаем корень: x = 0")
+            log("Из y₂ получаем корень: x = 0")
 
     return roots
 
 
+# Неинтерактивные режимы работы: ключ командной строки -> модуль с функцией main(argv)
+BATCH_MODES = {
+    '--stream': 'stream',
+    '--workers': 'sharded',
+    '--sweep': 'sweep',
+    '--serve': 'server',
+}
+
+
+def run_batch_mode(argv):
+    """
+    Запускает неинтерактивный режим, если первый аргумент — его ключ.
+    Возвращает код завершения или None, если режим не выбран.
+    """
+    if not argv or argv[0] not in BATCH_MODES:
+        return None
+
+    import importlib
+    module = importlib.import_module(BATCH_MODES[argv[0]])
+    return module.main(argv)
+
+
 def main():
 
+    exit_code = run_batch_mode(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+
     print("=" * 60)
     print("ПРОГРАММА ДЛЯ РЕШЕНИЯ БИКВАДРАТНОГО УРАВНЕНИЯ")
     print("Уравнение вида: Ax⁴ + Bx² + C = 0")
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Локальный сервер решения биквадратных уравнений на asyncio
+
+Принимает запросы в формате JSON Lines по TCP или Unix-сокету:
+    {"id": 1, "a": 1, "b": -5, "c": 4}
+и отвечает в том же порядке:
+    {"id": 1, "roots": [2.0, -2.0, 1.0, -1.0]}
+Запросы, пришедшие в течение короткого окна, решаются одним векторным
+вызовом solve_biquadratic_batch. Запрос {"cmd": "stats"} возвращает
+перцентили задержки и гистограмму размеров пакетов.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import Counter, deque
+
+import numpy as np
+
+from batch import solve_biquadratic_batch
+from program import is_valid_number
+
+DEFAULT_WINDOW = 0.002
+DEFAULT_MAX_BATCH = 4096
+LATENCY_SAMPLES = 10000
+
+
+class MicroBatcher:
+    """Собирает запросы в пакеты и решает их одним векторным вызовом"""
+
+    def __init__(self, window=DEFAULT_WINDOW, max_batch=DEFAULT_MAX_BATCH):
+        self.window = window
+        self.max_batch = max_batch
+        self._queue = asyncio.Queue()
+        self._task = None
+        # Последние задержки (сек) и количество пакетов по размеру
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.batch_sizes = Counter()
+
+    def start(self):
+        """Запускает цикл обработки пакетов"""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        """Останавливает цикл обработки пакетов"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def solve(self, a, b, c):
+        """Ставит уравнение в очередь и возвращает список его корней"""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((float(a), float(b), float(c), time.perf_counter(), future))
+        return await future
+
+    async def _collect(self):
+        """Ждет первый запрос и добирает остальные в течение окна"""
+        batch = [await self._queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.window
+        while len(batch) < self.max_batch:
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            try:
+                coefficients = np.array([item[:3] for item in batch], dtype=np.float64)
+                roots, counts = solve_biquadratic_batch(
+                    coefficients[:, 0], coefficients[:, 1], coefficients[:, 2]
+                )
+            except Exception as e:
+                # Ошибка пакета передается его запросам, цикл продолжает работу
+                for *_, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            now = time.perf_counter()
+            for (_, _, _, started, future), row, count in zip(batch, roots.tolist(), counts.tolist()):
+                if not future.done():
+                    future.set_result(row[:count])
+                self.latencies.append(now - started)
+            self.batch_sizes[_size_bucket(len(batch))] += 1
+
+    def stats(self):
+        """Перцентили задержки (мс) и гистограмма размеров пакетов"""
+        if self.latencies:
+            p50, p90, p99 = np.percentile(np.array(self.latencies) * 1000, [50, 90, 99])
+        else:
+            p50 = p90 = p99 = 0.0
+        return {
+            'latency_ms': {'p50': p50, 'p90': p90, 'p99': p99},
+            'batch_sizes': {str(size): number for size, number in sorted(self.batch_sizes.items())},
+            'window_ms': self.window * 1000,
+        }
+
+
+def _size_bucket(size):
+    """Корзина гистограммы: ближайшая сверху степень двойки"""
+    return 1 << (size - 1).bit_length()
+
+
+async def handle_request(batcher, line):
+    """Обрабатывает одну строку запроса и возвращает словарь ответа"""
+    try:
+        request = json.loads(line)
+    except ValueError:
+        return {'error': 'некорректный JSON'}
+    if not isinstance(request, dict):
+        return {'error': 'запрос должен быть объектом JSON'}
+
+    response = {'id': request['id']} if 'id' in request else {}
+    if request.get('cmd') == 'stats':
+        response['stats'] = batcher.stats()
+        return response
+
+    try:
+        coefficients = [request[name] for name in ('a', 'b', 'c')]
+    except KeyError as e:
+        response['error'] = f'нет коэффициента {e.args[0]}'
+        return response
+    # bool — подкласс int, но true/false в JSON не являются коэффициентами
+    if not all(isinstance(value, (int, float, str)) and not isinstance(value, bool)
+               and is_valid_number(value) for value in coefficients):
+        response['error'] = 'коэффициенты должны быть действительными числами'
+        return response
+
+    try:
+        response['roots'] = await batcher.solve(*coefficients)
+    except Exception as e:
+        # Ошибка пакета возвращается в ответе, соединение продолжает работу
+        response['error'] = f'ошибка решения: {e}'
+    return response
+
+
+async def serve_connection(batcher, reader, writer):
+    """Читает запросы соединения и отправляет ответы в порядке поступления"""
+    pending = asyncio.Queue()
+
+    async def send_responses():
+        while True:
+            task = await pending.get()
+            if task is None:
+                break
+            writer.write((json.dumps(await task, ensure_ascii=False) + '\n').encode('utf-8'))
+            await writer.drain()
+
+    sender = asyncio.ensure_future(send_responses())
+    try:
+        async for line in reader:
+            if line.strip():
+                await pending.put(asyncio.ensure_future(handle_request(batcher, line)))
+        await pending.put(None)
+        await sender
+    except ConnectionError:
+        sender.cancel()
+    finally:
+        writer.close()
+
+
+async def run_server(host='127.0.0.1', port=8765, unix_path=None,
+                     window=DEFAULT_WINDOW, max_batch=DEFAULT_MAX_BATCH):
+    """Запускает сервер и обслуживает соединения до остановки"""
+    batcher = MicroBatcher(window, max_batch)
+    batcher.start()
+
+    def on_connect(reader, writer):
+        return serve_connection(batcher, reader, writer)
+
+    if unix_path:
+        server = await asyncio.start_unix_server(on_connect, path=unix_path)
+        address = unix_path
+    else:
+        server = await asyncio.start_server(on_connect, host, port)
+        address = f'{host}:{port}'
+
+    print(f"Сервер запущен: {address}, окно {window * 1000:.1f} мс", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await batcher.stop()
+
+
+def main(argv=None):
+    """Точка входа режима сервера"""
+    parser = argparse.ArgumentParser(
+        prog='program.py --serve',
+        description='Сервер решения биквадратных уравнений (JSON Lines)',
+    )
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--host', default='127.0.0.1', help='адрес TCP')
+    parser.add_argument('--port', type=int, default=8765, help='порт TCP')
+    parser.add_argument('--unix', help='путь к Unix-сокету вместо TCP')
+    parser.add_argument('--window-ms', type=float, default=DEFAULT_WINDOW * 1000,
+                        help='окно сбора пакета в миллисекундах')
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH,
+                        help='максимальный размер пакета')
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(run_server(args.host, args.port, args.unix,
+                               args.window_ms / 1000, args.max_batch))
+    except KeyboardInterrupt:
+        print("\nСервер остановлен", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
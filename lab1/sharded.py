@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Многопроцессное решение биквадратных уравнений из двоичного файла
+
+Входной файл — последовательность записей из трех float64 (A, B, C).
+Выходной файл — записи из четырех float64 с корнями, дополненными NaN,
+в том же порядке, что и входные уравнения. Оба файла отображаются
+в память, каждый процесс обрабатывает свой непересекающийся диапазон записей.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from batch import MAX_ROOTS, solve_biquadratic_batch
+
+RECORD_FIELDS = 3
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+def count_records(path):
+    """Количество записей (A, B, C) во входном файле"""
+    size = os.path.getsize(path)
+    record_size = RECORD_FIELDS * np.dtype(np.float64).itemsize
+    if size % record_size:
+        raise ValueError(f"Размер файла {path} не кратен размеру записи ({record_size} байт)")
+    return size // record_size
+
+
+def solve_range(input_path, output_path, start, stop, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Решает записи [start, stop) входного файла и пишет корни в выходной файл
+
+    Выполняется в процессе-обработчике: через границу процессов передаются
+    только пути и номера записей.
+    """
+    total = count_records(input_path)
+    source = np.memmap(input_path, dtype=np.float64, mode='r', shape=(total, RECORD_FIELDS))
+    target = np.memmap(output_path, dtype=np.float64, mode='r+', shape=(total, MAX_ROOTS))
+
+    for begin in range(start, stop, chunk_size):
+        end = min(begin + chunk_size, stop)
+        block = source[begin:end]
+        roots, _ = solve_biquadratic_batch(block[:, 0], block[:, 1], block[:, 2])
+        target[begin:end] = roots
+
+    target.flush()
+    del source, target
+    return stop - start
+
+
+def split_ranges(total, parts):
+    """Делит диапазон [0, total) на parts непересекающихся частей"""
+    bounds = np.linspace(0, total, parts + 1).astype(np.int64)
+    return [(int(begin), int(end)) for begin, end in zip(bounds[:-1], bounds[1:]) if end > begin]
+
+
+def solve_file(input_path, output_path, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Решает все уравнения входного файла в пуле из workers процессов
+
+    Возвращает количество решенных уравнений.
+    """
+    workers = workers or os.cpu_count() or 1
+    total = count_records(input_path)
+
+    # Выходной файл создается заранее, чтобы процессы писали в него напрямую
+    with open(output_path, 'wb') as f:
+        f.truncate(total * MAX_ROOTS * np.dtype(np.float64).itemsize)
+
+    ranges = split_ranges(total, workers)
+    if workers == 1 or len(ranges) <= 1:
+        for start, stop in ranges:
+            solve_range(input_path, output_path, start, stop, chunk_size)
+        return total
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(solve_range, input_path, output_path, start, stop, chunk_size)
+                   for start, stop in ranges]
+        for future in futures:
+            future.result()
+    return total
+
+
+def main(argv=None):
+    """Точка входа многопроцессного режима"""
+    parser = argparse.ArgumentParser(
+        prog='program.py --workers N',
+        description='Многопроцессное решение биквадратных уравнений из двоичного файла float64',
+    )
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help='количество процессов')
+    parser.add_argument('input', help='входной файл записей (A, B, C) float64')
+    parser.add_argument('output', help='выходной файл записей из 4 корней float64')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help='количество уравнений, решаемых за один шаг')
+    args = parser.parse_args(argv)
+
+    start_time = time.perf_counter()
+    solved = solve_file(args.input, args.output, args.workers, args.chunk_size)
+    elapsed = time.perf_counter() - start_time
+
+    speed = solved / elapsed if elapsed > 0 else 0.0
+    print(f"Решено уравнений: {solved}, процессов: {args.workers}, "
+          f"время: {elapsed:.2f} сек, скорость: {speed:.0f} уравнений/сек",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
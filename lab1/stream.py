@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Потоковый режим решения биквадратных уравнений
+
+Читает тройки коэффициентов A, B, C (CSV или через пробел) из файла или stdin,
+решает их блоками фиксированного размера и пишет корни в CSV или JSON Lines.
+Память ограничена размером блока.
+"""
+
+import argparse
+import json
+import sys
+import time
+from itertools import islice
+
+import numpy as np
+
+from batch import MAX_ROOTS, solve_biquadratic_batch
+from program import is_valid_number
+
+DEFAULT_CHUNK_SIZE = 65536
+
+
+def parse_chunk(lines):
+    """
+    Разбирает блок строк в массив коэффициентов (n, 3)
+
+    Пустые строки и комментарии (#) пропускаются. Если блок целиком не
+    преобразуется в числа, строки проверяются по отдельности через
+    is_valid_number, а некорректные (например, заголовок CSV) отбрасываются.
+    Возвращает (coefficients, skipped).
+    """
+    rows = []
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            rows.append(line.replace(',', ' ').split())
+
+    try:
+        coefficients = np.array(rows, dtype=np.float64)
+        if coefficients.ndim == 2 and coefficients.shape[1] == 3:
+            return coefficients, 0
+    except ValueError:
+        pass
+
+    valid = [row for row in rows
+             if len(row) == 3 and all(is_valid_number(value) for value in row)]
+    coefficients = np.array(valid, dtype=np.float64).reshape(-1, 3)
+    return coefficients, len(rows) - len(valid)
+
+
+def iter_chunks(stream, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Читает поток блоками по chunk_size строк"""
+    while True:
+        lines = list(islice(stream, chunk_size))
+        if not lines:
+            return
+        yield lines
+
+
+# Шаблоны строк CSV для каждого количества корней: %r сохраняет точность float
+CSV_TEMPLATES = [
+    '%r,%r,%r,' + str(count) + ',%r' * count + ',' * (MAX_ROOTS - count)
+    for count in range(MAX_ROOTS + 1)
+]
+
+
+def format_csv(coefficients, roots, counts):
+    """Форматирует блок результатов в строки CSV"""
+    out = [CSV_TEMPLATES[count] % tuple(coef + row[:count])
+           for coef, row, count in zip(coefficients.tolist(), roots.tolist(), counts.tolist())]
+    return '\n'.join(out) + '\n' if out else ''
+
+
+def format_jsonl(coefficients, roots, counts):
+    """Форматирует блок результатов в строки JSON Lines"""
+    out = []
+    for (a, b, c), row, count in zip(coefficients.tolist(), roots.tolist(), counts.tolist()):
+        out.append(json.dumps({'a': a, 'b': b, 'c': c, 'roots': row[:count]}))
+    return '\n'.join(out) + '\n' if out else ''
+
+
+FORMATTERS = {
+    'csv': format_csv,
+    'jsonl': format_jsonl,
+}
+
+CSV_HEADER = 'a,b,c,count,' + ','.join(f'x{i + 1}' for i in range(MAX_ROOTS)) + '\n'
+
+
+def solve_stream(source, target, output_format='csv', chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Решает все уравнения из потока source и пишет корни в поток target
+
+    Возвращает словарь статистики: количество решенных уравнений,
+    пропущенных строк, время работы и пропускную способность.
+    """
+    formatter = FORMATTERS[output_format]
+    if output_format == 'csv':
+        target.write(CSV_HEADER)
+
+    solved = 0
+    skipped = 0
+    start_time = time.perf_counter()
+
+    for lines in iter_chunks(source, chunk_size):
+        coefficients, chunk_skipped = parse_chunk(lines)
+        skipped += chunk_skipped
+        if len(coefficients) == 0:
+            continue
+
+        roots, counts = solve_biquadratic_batch(
+            coefficients[:, 0], coefficients[:, 1], coefficients[:, 2]
+        )
+        target.write(formatter(coefficients, roots, counts))
+        solved += len(coefficients)
+
+    elapsed = time.perf_counter() - start_time
+    return {
+        'solved': solved,
+        'skipped': skipped,
+        'seconds': elapsed,
+        'equations_per_second': solved / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def main(argv=None):
+    """Точка входа потокового режима"""
+    parser = argparse.ArgumentParser(
+        prog='program.py --stream',
+        description='Потоковое решение биквадратных уравнений Ax⁴ + Bx² + C = 0',
+    )
+    parser.add_argument('--stream', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('input', nargs='?', default='-',
+                        help='файл с коэффициентами A, B, C (по умолчанию stdin)')
+    parser.add_argument('-o', '--output', default='-',
+                        help='файл для записи корней (по умолчанию stdout)')
+    parser.add_argument('-f', '--format', choices=sorted(FORMATTERS), default='csv',
+                        help='формат вывода')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help='количество уравнений в одном блоке')
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    target = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        stats = solve_stream(source, target, args.format, args.chunk_size)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+    print(f"Решено уравнений: {stats['solved']}, пропущено строк: {stats['skipped']}, "
+          f"время: {stats['seconds']:.2f} сек, "
+          f"скорость: {stats['equations_per_second']:.0f} уравнений/сек",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Перебор параметров биквадратного уравнения по сетке коэффициентов
+
+Сетка A × B × C никогда не строится целиком: она вычисляется плитками
+ограниченного размера (блок B × блок C × часть A), плитки обрабатываются
+параллельно, а по оси A накапливаются только агрегаты для каждой пары (B, C):
+гистограмма количества корней и минимальный/максимальный модуль корня.
+Если блоков (B, C) меньше, чем процессов, ось A тоже делится на отрезки,
+а частичные агрегаты отрезков объединяются.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from batch import MAX_ROOTS, solve_biquadratic_batch
+
+DEFAULT_TILE_SIZE = 1 << 20
+
+
+def axis_values(axis):
+    """Значения коэффициента для диапазона (start, stop, num)"""
+    start, stop, num = axis
+    return np.linspace(start, stop, int(num))
+
+
+def split_axis(num, block):
+    """Разбивает ось длины num на отрезки не длиннее block"""
+    return [(begin, min(begin + block, num)) for begin in range(0, num, block)]
+
+
+def sweep_tile(a_axis, b_axis, c_axis, a_range, b_range, c_range, a_chunk):
+    """
+    Вычисляет агрегаты для блока (B, C) по значениям A из отрезка a_range
+
+    Возвращает (b_range, c_range, histogram, min_abs, max_abs).
+    """
+    a_values = axis_values(a_axis)[a_range[0]:a_range[1]]
+    b_values = axis_values(b_axis)[b_range[0]:b_range[1]]
+    c_values = axis_values(c_axis)[c_range[0]:c_range[1]]
+
+    shape = (len(b_values), len(c_values))
+    histogram = np.zeros(shape + (MAX_ROOTS + 1,), dtype=np.int64)
+    min_abs = np.full(shape, np.nan)
+    max_abs = np.full(shape, np.nan)
+
+    b_grid, c_grid = np.meshgrid(b_values, c_values, indexing='ij')
+    for begin, end in split_axis(len(a_values), a_chunk):
+        a_part = a_values[begin:end]
+        # Плитка формы (a, b, c) разворачивается в вектор уравнений
+        a_tile = np.broadcast_to(a_part[:, None, None], (len(a_part),) + shape)
+        b_tile = np.broadcast_to(b_grid, a_tile.shape)
+        c_tile = np.broadcast_to(c_grid, a_tile.shape)
+
+        roots, counts = solve_biquadratic_batch(a_tile, b_tile, c_tile)
+        counts = counts.reshape(a_tile.shape)
+        magnitudes = np.abs(roots).reshape(a_tile.shape + (MAX_ROOTS,))
+
+        for count in range(MAX_ROOTS + 1):
+            histogram[..., count] += (counts == count).sum(axis=0)
+        # fmin/fmax пропускают NaN, которыми дополнены строки корней
+        min_abs = np.fmin(min_abs, np.fmin.reduce(magnitudes, axis=(0, 3)))
+        max_abs = np.fmax(max_abs, np.fmax.reduce(magnitudes, axis=(0, 3)))
+
+    return b_range, c_range, histogram, min_abs, max_abs
+
+
+def plan_tiles(a_num, b_num, c_num, tile_size):
+    """
+    Подбирает размеры плитки так, чтобы в ней было не больше tile_size уравнений
+
+    Возвращает (b_block, c_block, a_chunk).
+    """
+    c_block = max(1, min(c_num, int(np.sqrt(tile_size))))
+    b_block = max(1, min(b_num, tile_size // c_block))
+    a_chunk = max(1, min(a_num, tile_size // (b_block * c_block)))
+    return b_block, c_block, a_chunk
+
+
+def plan_tasks(a_num, b_num, c_num, tile_size, workers):
+    """
+    Задачи (a_range, b_range, c_range) и размер части A внутри задачи
+
+    Блоки (B, C) выбираются по plan_tiles; если блоков меньше, чем
+    процессов, ось A делится на отрезки, чтобы задач было не меньше workers.
+    """
+    b_block, c_block, a_chunk = plan_tiles(a_num, b_num, c_num, tile_size)
+    blocks = [(b_range, c_range)
+              for b_range in split_axis(b_num, b_block)
+              for c_range in split_axis(c_num, c_block)]
+    a_parts = min(a_num, -(-workers // len(blocks))) if a_num else 1
+    a_ranges = split_axis(a_num, -(-a_num // a_parts)) if a_num else [(0, 0)]
+    tasks = [(a_range, b_range, c_range)
+             for a_range in a_ranges
+             for b_range, c_range in blocks]
+    return tasks, a_chunk
+
+
+def sweep(a_axis, b_axis, c_axis, workers=None, tile_size=DEFAULT_TILE_SIZE):
+    """
+    Перебирает сетку коэффициентов и возвращает карты по срезам (B, C)
+
+    Каждая ось задается кортежем (start, stop, num) как в numpy.linspace.
+    Возвращает словарь с массивами:
+    histogram — (nB, nC, 5) количество значений A с 0..4 корнями,
+    min_abs, max_abs — (nB, nC) минимальный и максимальный модуль корня
+    (NaN, если корней нет ни при одном A), а также значения осей B и C.
+    """
+    a_num, b_num, c_num = int(a_axis[2]), int(b_axis[2]), int(c_axis[2])
+    workers = workers or os.cpu_count() or 1
+    ranges, a_chunk = plan_tasks(a_num, b_num, c_num, tile_size, workers)
+
+    histogram = np.zeros((b_num, c_num, MAX_ROOTS + 1), dtype=np.int64)
+    min_abs = np.full((b_num, c_num), np.nan)
+    max_abs = np.full((b_num, c_num), np.nan)
+
+    tasks = [(a_axis, b_axis, c_axis, a_range, b_range, c_range, a_chunk)
+             for a_range, b_range, c_range in ranges]
+
+    if workers == 1 or len(tasks) <= 1:
+        results = (sweep_tile(*task) for task in tasks)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(sweep_tile, *zip(*tasks))
+
+    try:
+        # Частичные агрегаты разных отрезков A складываются
+        for b_range, c_range, tile_hist, tile_min, tile_max in results:
+            region = (slice(*b_range), slice(*c_range))
+            histogram[region] += tile_hist
+            min_abs[region] = np.fmin(min_abs[region], tile_min)
+            max_abs[region] = np.fmax(max_abs[region], tile_max)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return {
+        'b': axis_values(b_axis),
+        'c': axis_values(c_axis),
+        'histogram': histogram,
+        'min_abs': min_abs,
+        'max_abs': max_abs,
+    }
+
+
+def main(argv=None):
+    """Точка входа режима перебора параметров"""
+    parser = argparse.ArgumentParser(
+        prog='program.py --sweep',
+        description='Карты структуры корней Ax⁴ + Bx² + C = 0 по сетке коэффициентов',
+    )
+    parser.add_argument('--sweep', action='store_true', help=argparse.SUPPRESS)
+    for name in ('a', 'b', 'c'):
+        parser.add_argument(f'-{name}', nargs=3, type=float, required=True,
+                            metavar=('START', 'STOP', 'NUM'),
+                            help=f'диапазон коэффициента {name.upper()}')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help='количество процессов')
+    parser.add_argument('--tile-size', type=int, default=DEFAULT_TILE_SIZE,
+                        help='максимальное количество уравнений в плитке')
+    parser.add_argument('-o', '--output', help='файл .npz для сохранения карт')
+    args = parser.parse_args(argv)
+
+    start_time = time.perf_counter()
+    maps = sweep(args.a, args.b, args.c, args.workers, args.tile_size)
+    elapsed = time.perf_counter() - start_time
+
+    total = int(args.a[2]) * int(args.b[2]) * int(args.c[2])
+    totals = maps['histogram'].sum(axis=(0, 1))
+    print(f"Уравнений в сетке: {total}, время: {elapsed:.2f} сек")
+    for count, number in enumerate(totals):
+        print(f"  {count} корней: {number}")
+
+    if args.output:
+        np.savez_compressed(args.output, **maps)
+        print(f"Карты сохранены в {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,266 @@
+import asyncio
+import io
+import json
+import math
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+from program import solve_biquadratic
+from batch import solve_biquadratic_batch, roots_to_lists
+from stream import solve_stream
+from sharded import solve_file
+from cache import RootCache
+from sweep import sweep, axis_values, plan_tasks
+import server
+from server import MicroBatcher, handle_request, serve_connection
+from polynomial import solve_polynomials
+
+
+# Случаи с кратными корнями, нулевым дискриминантом и y == 0
+EDGE_CASES = [
+    (1, -5, 4),      # четыре корня
+    (1, -2, 1),      # D == 0, y > 0
+    (1, 0, 0),       # D == 0, y == 0
+    (1, 2, 1),       # D == 0, y < 0
+    (1, -1, 0),      # y₁ > 0, y₂ == 0
+    (1, 1, 0),       # y₁ == 0, y₂ < 0
+    (-1, 1, 0),      # y₁ == 0 при отрицательном A
+    (1, 0, -4),      # y₁ > 0, y₂ < 0
+    (1, 0, 4),       # D < 0
+    (1, 5, 4),       # оба y отрицательные
+    (0, 1, 1),       # A == 0
+    (2, -10, 8),
+    (0.5, -0.5, 0),
+    (1e-300, 1, 1),
+]
+
+
+class TestBiquadratic(unittest.TestCase):
+    """Класс для тестирования решения биквадратных уравнений"""
+
+    def assertSameRoots(self, expected, actual, coefficients):
+        self.assertEqual(len(expected), len(actual), coefficients)
+        for x, y in zip(expected, actual):
+            self.assertTrue(math.isclose(x, y, rel_tol=1e-12, abs_tol=1e-300),
+                            (coefficients, expected, actual))
+
+    # Тест 1: Пакетное решение совпадает со скалярным на особых случаях
+    def test_batch_edge_cases(self):
+        """Тест пакетного решения на кратных корнях и y == 0"""
+        a, b, c = zip(*EDGE_CASES)
+        roots, counts = solve_biquadratic_batch(a, b, c)
+        for coefficients, actual in zip(EDGE_CASES, roots_to_lists(roots, counts)):
+            expected = solve_biquadratic(*coefficients, verbose=False)
+            self.assertSameRoots(expected, actual, coefficients)
+
+    # Тест 2: Пакетное решение совпадает со скалярным на случайных данных
+    def test_batch_random(self):
+        """Тест пакетного решения на случайных целых коэффициентах"""
+        rnd = random.Random(0)
+        cases = [(rnd.choice([-3, -1, 1, 2]), rnd.randint(-20, 20), rnd.randint(-20, 20))
+                 for _ in range(5000)]
+        a, b, c = (np.array(column, dtype=np.float64) for column in zip(*cases))
+        roots, counts = solve_biquadratic_batch(a, b, c)
+        for coefficients, actual in zip(cases, roots_to_lists(roots, counts)):
+            expected = solve_biquadratic(*coefficients, verbose=False)
+            self.assertSameRoots(expected, actual, coefficients)
+
+    # Тест 3: Потоковый режим
+    def test_stream(self):
+        """Тест потокового решения с пропуском некорректных строк"""
+        source = io.StringIO("a,b,c\n1,-5,4\n# комментарий\n1 0 4\nx,1,2\n1,-2,1\n")
+        target = io.StringIO()
+        stats = solve_stream(source, target, 'csv', chunk_size=2)
+        self.assertEqual(stats['solved'], 3)
+        self.assertEqual(stats['skipped'], 2)
+        lines = target.getvalue().splitlines()
+        self.assertEqual(lines[0], 'a,b,c,count,x1,x2,x3,x4')
+        self.assertEqual(lines[1], '1.0,-5.0,4.0,4,2.0,-2.0,1.0,-1.0')
+        self.assertEqual(lines[2], '1.0,0.0,4.0,0,,,,')
+        self.assertEqual(lines[3], '1.0,-2.0,1.0,2,1.0,-1.0,,')
+
+    # Тест 4: Многопроцессный режим над двоичными файлами
+    def test_sharded(self):
+        """Тест решения файла несколькими процессами"""
+        rnd = np.random.default_rng(0)
+        coefficients = rnd.integers(-10, 10, size=(1000, 3)).astype(np.float64)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            input_path = os.path.join(tmp_dir, 'input.bin')
+            output_path = os.path.join(tmp_dir, 'output.bin')
+            coefficients.tofile(input_path)
+
+            self.assertEqual(solve_file(input_path, output_path, workers=2, chunk_size=128), 1000)
+            roots = np.fromfile(output_path, dtype=np.float64).reshape(-1, 4)
+
+        expected, _ = solve_biquadratic_batch(*coefficients.T)
+        np.testing.assert_array_equal(roots, expected)
+
+    # Тест 5: Сохранение и загрузка кэша корней
+    def test_cache_save_load(self):
+        """Тест загрузки кэша с тем же и с другим шагом квантования"""
+        cache = RootCache(maxsize=10)
+        for coefficients in [(1, -5.2, 4.1), (1, -5, 4), (1, -2, 1)]:
+            cache.solve(*coefficients)
+        self.assertEqual(cache.solve(1, -5, 4), [2.0, -2.0, 1.0, -1.0])
+        self.assertEqual(cache.stats()['hits'], 1)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'cache.json')
+            cache.save(path)
+
+            loaded = RootCache.load(path)
+            self.assertEqual(len(loaded), 3)
+            self.assertIn((1, -5.2, 4.1), loaded)
+            self.assertEqual(loaded.solve(1, -2, 1), [1.0, -1.0])
+            self.assertEqual(loaded.stats()['hits'], 1)
+
+            # Записи с другим шагом квантования не переиспользуются
+            coarse = RootCache.load(path, tolerance=1.0)
+            self.assertEqual(len(coarse), 0)
+            self.assertEqual(coarse.solve(1, -5, 4), [2.0, -2.0, 1.0, -1.0])
+            self.assertEqual(RootCache.load(os.path.join(tmp_dir, 'missing.json')).stats()['size'], 0)
+
+    # Тест 6: Перебор параметров по сетке плитками
+    def test_sweep(self):
+        """Тест карт перебора на малой сетке в сравнении с пакетным решением"""
+        a_axis, b_axis, c_axis = (-2, 2, 5), (-6, 6, 7), (-4, 4, 9)
+        # Маленькая плитка, чтобы сетка разбилась на несколько плиток и частей A
+        maps = sweep(a_axis, b_axis, c_axis, workers=1, tile_size=16)
+
+        a, b, c = np.meshgrid(axis_values(a_axis), axis_values(b_axis),
+                              axis_values(c_axis), indexing='ij')
+        roots, counts = solve_biquadratic_batch(a, b, c)
+        counts = counts.reshape(a.shape)
+        magnitudes = np.abs(roots).reshape(a.shape + (4,))
+
+        self.assertEqual(maps['histogram'].shape, (7, 9, 5))
+        self.assertTrue((maps['histogram'].sum(axis=2) == 5).all())
+        for count in range(5):
+            np.testing.assert_array_equal(maps['histogram'][..., count],
+                                          (counts == count).sum(axis=0))
+        np.testing.assert_array_equal(maps['min_abs'], np.fmin.reduce(magnitudes, axis=(0, 3)))
+        np.testing.assert_array_equal(maps['max_abs'], np.fmax.reduce(magnitudes, axis=(0, 3)))
+
+    # Тест 7: Сервер с пакетной обработкой запросов
+    def test_server_batching(self):
+        """Тест ответов сервера и продолжения работы после ошибки пакета"""
+        async def scenario():
+            batcher = MicroBatcher(window=0.01)
+            batcher.start()
+            try:
+                responses = await asyncio.gather(
+                    handle_request(batcher, '{"id": 1, "a": 1, "b": -5, "c": 4}'),
+                    handle_request(batcher, '{"id": 2, "a": 1, "b": 0, "c": 4}'),
+                    handle_request(batcher, '{"id": 3, "a": 1}'),
+                    handle_request(batcher, 'не JSON'),
+                )
+
+                error = None
+                solve = server.solve_biquadratic_batch
+                server.solve_biquadratic_batch = lambda *args: 1 / 0
+                try:
+                    await batcher.solve(1, -5, 4)
+                except ZeroDivisionError as e:
+                    error = e
+                finally:
+                    server.solve_biquadratic_batch = solve
+                # После ошибки цикл обработки продолжает работу
+                roots = await asyncio.wait_for(batcher.solve(1, -2, 1), 1)
+                stats = (await handle_request(batcher, '{"cmd": "stats"}'))['stats']
+            finally:
+                await batcher.stop()
+            return responses, error, roots, stats
+
+        responses, error, roots, stats = asyncio.run(scenario())
+        self.assertEqual(responses[0], {'id': 1, 'roots': [2.0, -2.0, 1.0, -1.0]})
+        self.assertEqual(responses[1], {'id': 2, 'roots': []})
+        self.assertEqual(responses[2], {'id': 3, 'error': 'нет коэффициента b'})
+        self.assertIn('error', responses[3])
+        self.assertIsInstance(error, ZeroDivisionError)
+        self.assertEqual(roots, [1.0, -1.0])
+        self.assertEqual(stats['batch_sizes'], {'2': 1, '1': 1})
+
+    # Тест 8: Многочлены с кратными корнями
+    def test_polynomial_multiple_roots(self):
+        """Тест того, что кратный корень возвращается один раз"""
+        cases = [
+            ([0.5] * 4, [0.5]),
+            ([1, 1, 1, -2], [-2, 1]),
+            ([-3] * 3 + [2, 2], [-3, 2]),
+            ([1, 1.001, 4, 4], [1, 1.001, 4]),
+            ([0, 0, 0, 5], [0, 5]),
+        ]
+        for true_roots, expected in cases:
+            roots, counts = solve_polynomials(np.poly(true_roots))
+            self.assertEqual(counts[0], len(expected), true_roots)
+            np.testing.assert_allclose(roots[0, :counts[0]], expected, rtol=1e-9, atol=1e-12)
+
+        # x(x² - 1)² и (x - 1)³(x² + 1) в одном пакете
+        coefficients = np.array([[1, 0, -2, 0, 1, 0], np.poly([1, 1, 1, 1j, -1j]).real])
+        roots, counts = solve_polynomials(coefficients)
+        self.assertEqual(counts.tolist(), [3, 1])
+        np.testing.assert_allclose(roots[0, :3], [-1, 0, 1], atol=1e-12)
+        np.testing.assert_allclose(roots[1, :1], [1], rtol=1e-9)
+
+    # Тест 9: Перебор с малой сеткой (B, C) делит ось A между процессами
+    def test_sweep_splits_a_axis(self):
+        """Тест того, что при одном блоке (B, C) задач не меньше процессов"""
+        a_axis, b_axis, c_axis = (-3, 3, 40), (-6, 6, 5), (-4, 4, 4)
+        tasks, _ = plan_tasks(40, 5, 4, 1 << 20, workers=3)
+        self.assertEqual(len(tasks), 3)
+        self.assertEqual([a_range for a_range, _, _ in tasks], [(0, 14), (14, 28), (28, 40)])
+
+        serial = sweep(a_axis, b_axis, c_axis, workers=1)
+        parallel = sweep(a_axis, b_axis, c_axis, workers=3)
+        for name in ('histogram', 'min_abs', 'max_abs'):
+            np.testing.assert_array_equal(parallel[name], serial[name])
+        self.assertTrue((parallel['histogram'].sum(axis=2) == 40).all())
+
+    # Тест 10: Соединение продолжает отвечать после ошибки пакета
+    def test_server_connection_after_error(self):
+        """Тест ответа с ошибкой и следующих ответов в том же соединении"""
+        async def scenario():
+            batcher = MicroBatcher(window=0.001)
+            batcher.start()
+            tcp_server = await asyncio.start_server(
+                lambda reader, writer: serve_connection(batcher, reader, writer), '127.0.0.1', 0)
+            port = tcp_server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+
+            async def ask(request):
+                writer.write((json.dumps(request) + '\n').encode('utf-8'))
+                await writer.drain()
+                return json.loads(await asyncio.wait_for(reader.readline(), 1))
+
+            try:
+                responses = [await ask({'id': 1, 'a': 1, 'b': -5, 'c': 4})]
+                solve = server.solve_biquadratic_batch
+                server.solve_biquadratic_batch = lambda *args: 1 / 0
+                try:
+                    responses.append(await ask({'id': 2, 'a': 1, 'b': -5, 'c': 4}))
+                finally:
+                    server.solve_biquadratic_batch = solve
+                responses.append(await ask({'id': 3, 'a': True, 'b': 0, 'c': -1}))
+                responses.append(await ask({'id': 4, 'a': 1, 'b': -2, 'c': 1}))
+            finally:
+                writer.close()
+                tcp_server.close()
+                await tcp_server.wait_closed()
+                await batcher.stop()
+            return responses
+
+        responses = asyncio.run(scenario())
+        self.assertEqual(responses[0], {'id': 1, 'roots': [2.0, -2.0, 1.0, -1.0]})
+        self.assertEqual(responses[1]['id'], 2)
+        self.assertIn('error', responses[1])
+        self.assertEqual(responses[2], {'id': 3, 'error': 'коэффициенты должны быть действительными числами'})
+        self.assertEqual(responses[3], {'id': 4, 'roots': [1.0, -1.0]})
+
+
+if __name__ == '__main__':
+
+    unittest.main(verbosity=2)
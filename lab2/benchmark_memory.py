@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Замер памяти на одну фигуру для разных раскладок объектов
+
+Сравниваются:
+    - исходная раскладка: атрибуты в __dict__, у каждой фигуры свой цвет;
+    - __slots__: фигуры и цвета без __dict__;
+    - __slots__ и разделяемые цвета (аргумент shared_color=True).
+Память считается через tracemalloc как прирост после создания n фигур.
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from functools import partial
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from lab_python_oop import Rectangle, Circle, Square
+
+COLORS = ["синий", "зеленый", "красный", "желтый", "черный"]
+
+
+# Классы с исходной раскладкой (до перехода на __slots__)
+class DictColor:
+    def __init__(self, color):
+        self._color = color
+
+
+class DictRectangle:
+    def __init__(self, width, height, color):
+        self.width = width
+        self.height = height
+        self.color_obj = DictColor(color)
+
+
+class DictCircle:
+    def __init__(self, radius, color):
+        self.radius = radius
+        self.color_obj = DictColor(color)
+
+
+class DictSquare(DictRectangle):
+    def __init__(self, side, color):
+        super().__init__(side, side, color)
+
+
+def make_figures(n, rectangle, circle, square):
+    """n фигур трех видов с размерами-float и несколькими цветами"""
+    figures = []
+    for i in range(n):
+        size = (i % 1000) + 0.5
+        color = COLORS[i % len(COLORS)]
+        kind = i % 3
+        if kind == 0:
+            figures.append(rectangle(size, size + 1.0, color))
+        elif kind == 1:
+            figures.append(circle(size, color))
+        else:
+            figures.append(square(size, color))
+    return figures
+
+
+def measure(n, rectangle, circle, square):
+    """Байт на фигуру и время создания n фигур"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start_time = time.perf_counter()
+    figures = make_figures(n, rectangle, circle, square)
+    elapsed = time.perf_counter() - start_time
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del figures
+    gc.collect()
+    return (after - before) / n, elapsed
+
+
+def main(argv=None):
+    """Запуск замеров"""
+    parser = argparse.ArgumentParser(description='Память на фигуру для разных раскладок')
+    parser.add_argument('-n', type=int, default=10 ** 7, help='количество фигур')
+    args = parser.parse_args(argv)
+
+    results = {}
+    results['__dict__'] = measure(args.n, DictRectangle, DictCircle, DictSquare)
+
+    results['__slots__'] = measure(args.n, Rectangle, Circle, Square)
+    results['__slots__ + разделяемые цвета'] = measure(
+        args.n, *(partial(cls, shared_color=True) for cls in (Rectangle, Circle, Square)))
+
+    print(f"Фигур: {args.n}")
+    baseline = results['__dict__'][0]
+    for name, (bytes_per_figure, elapsed) in results.items():
+        reduction = (1 - bytes_per_figure / baseline) * 100
+        print(f"  {name:32} {bytes_per_figure:7.1f} байт/фигуру "
+              f"(-{reduction:4.1f}%), создание {elapsed:.2f} сек, "
+              f"всего {bytes_per_figure * args.n / 2 ** 20:.0f} МиБ")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,11 +4,24 @@ from .color import FigureColor
 from .rectangle import Rectangle
 from .circle import Circle
 from .square import Square
+from .collection import FigureCollection, FigureView
+from .area_index import AreaIndex
+from .serialization import (
+    FigureWriter, FigureReader, MappedFigures, save_figures, load_collection
+)
 
 __all__ = [
     'GeometricFigure',
     'FigureColor',
     'Rectangle',
     'Circle',
-    'Square'
+    'Square',
+    'FigureCollection',
+    'FigureView',
+    'AreaIndex',
+    'FigureWriter',
+    'FigureReader',
+    'MappedFigures',
+    'save_figures',
+    'load_collection'
 ]
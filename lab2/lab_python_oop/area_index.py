@@ -0,0 +1,224 @@
+from bisect import bisect_left, bisect_right, insort
+from itertools import count
+
+# Целевой размер отсортированного списка-корзины; при вдвое большем
+# размере корзина делится пополам
+LOAD = 512
+
+
+class AreaIndex:
+    """
+    Индекс фигур, упорядоченный по площади
+
+    Ключи (площадь, порядковый номер) хранятся в отсортированных корзинах,
+    наибольшие ключи корзин — в отдельном списке для двоичного поиска,
+    а размеры корзин — в дереве Фенвика для запросов по позиции. Вставка,
+    удаление и ранг выполняются за O(log n) поисков и сдвиг в пределах
+    одной корзины, top(k) и range — за O(log n + k).
+
+    Индекс подписывается на изменение размеров своих фигур
+    (GeometricFigure.subscribe) и переставляет фигуру сам, поэтому
+    явно вызывать update(figure) не требуется. Подписки слабые: индекс,
+    на который больше нет ссылок, удаляется вместе с подписками.
+    """
+
+    def __init__(self, figures=()):
+        self._buckets = []
+        self._maxes = []
+        self._tree = []
+        self._keys = {}
+        self._figures = {}
+        self._numbers = count()
+
+        keys = []
+        for figure in figures:
+            keys.append(self._register(figure))
+        keys.sort()
+        self._buckets = [keys[i:i + LOAD] for i in range(0, len(keys), LOAD)]
+        self._maxes = [bucket[-1] for bucket in self._buckets]
+        self._build_tree()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, figure):
+        return id(figure) in self._keys
+
+    def __iter__(self):
+        """Фигуры по возрастанию площади"""
+        for bucket in self._buckets:
+            for _, number in bucket:
+                yield self._figures[number]
+
+    # ---------- Дерево Фенвика по размерам корзин ----------
+
+    def _build_tree(self):
+        tree = [0] + [len(bucket) for bucket in self._buckets]
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _tree_add(self, bucket_index, delta):
+        i = bucket_index + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def _tree_prefix(self, bucket_index):
+        """Количество ключей в корзинах с номерами меньше bucket_index"""
+        total = 0
+        i = bucket_index
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def _locate(self, position):
+        """Номер корзины и позиция в ней для позиции в общем порядке"""
+        i = 0
+        step = 1 << (len(self._tree) - 1).bit_length()
+        while step:
+            nxt = i + step
+            if nxt < len(self._tree) and self._tree[nxt] <= position:
+                i = nxt
+                position -= self._tree[nxt]
+            step >>= 1
+        return i, position
+
+    # ---------- Изменение ----------
+
+    def _register(self, figure):
+        if id(figure) in self._keys:
+            raise ValueError("Фигура уже есть в индексе")
+        number = next(self._numbers)
+        key = (figure.area(), number)
+        self._keys[id(figure)] = key
+        self._figures[number] = figure
+        figure.subscribe(self)
+        return key
+
+    def add(self, figure):
+        """Добавляет фигуру"""
+        self._insert(self._register(figure))
+
+    def _insert(self, key):
+        if not self._buckets:
+            self._buckets.append([key])
+            self._maxes.append(key)
+            self._build_tree()
+            return
+
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            i -= 1
+        bucket = self._buckets[i]
+        insort(bucket, key)
+        self._maxes[i] = bucket[-1]
+        if len(bucket) > 2 * LOAD:
+            self._buckets[i:i + 1] = [bucket[:LOAD], bucket[LOAD:]]
+            self._maxes[i:i + 1] = [bucket[LOAD - 1], bucket[-1]]
+            self._build_tree()
+        else:
+            self._tree_add(i, 1)
+
+    def remove(self, figure):
+        """Удаляет фигуру"""
+        key = self._keys.pop(id(figure), None)
+        if key is None:
+            raise KeyError("Фигуры нет в индексе")
+        del self._figures[key[1]]
+        figure.unsubscribe(self)
+        self._delete(key)
+
+    def _delete(self, key):
+        i = bisect_left(self._maxes, key)
+        bucket = self._buckets[i]
+        del bucket[bisect_left(bucket, key)]
+        if bucket:
+            self._maxes[i] = bucket[-1]
+            self._tree_add(i, -1)
+        else:
+            del self._buckets[i]
+            del self._maxes[i]
+            self._build_tree()
+
+    def update(self, figure):
+        """Переставляет фигуру после изменения ее размеров"""
+        key = self._keys.get(id(figure))
+        if key is None:
+            raise KeyError("Фигуры нет в индексе")
+        area = figure.area()
+        if area == key[0]:
+            return
+        self._delete(key)
+        key = self._keys[id(figure)] = (area, key[1])
+        self._insert(key)
+
+    def clear(self):
+        """Удаляет все фигуры и отменяет подписки на их изменение"""
+        for figure in self._figures.values():
+            figure.unsubscribe(self)
+        self._buckets = []
+        self._maxes = []
+        self._keys = {}
+        self._figures = {}
+        self._build_tree()
+
+    def figure_changed(self, figure):
+        """Вызывается фигурой при изменении размеров (см. GeometricFigure.subscribe)"""
+        self.update(figure)
+
+    # ---------- Запросы ----------
+
+    def __getitem__(self, position):
+        """Фигура с данной позицией в порядке возрастания площади"""
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("позиция вне индекса")
+        i, j = self._locate(position)
+        return self._figures[self._buckets[i][j][1]]
+
+    def _rank_key(self, key):
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            return len(self)
+        return self._tree_prefix(i) + bisect_left(self._buckets[i], key)
+
+    def rank(self, figure):
+        """Количество фигур, площадь которых меньше площади данной фигуры"""
+        key = self._keys.get(id(figure))
+        if key is None:
+            raise KeyError("Фигуры нет в индексе")
+        return self._rank_key((key[0],))
+
+    def count_less(self, area):
+        """Количество фигур с площадью меньше area"""
+        return self._rank_key((area,))
+
+    def top(self, k):
+        """k фигур с наибольшей площадью по убыванию площади"""
+        result = []
+        for bucket in reversed(self._buckets):
+            for _, number in reversed(bucket):
+                if len(result) >= k:
+                    return result
+                result.append(self._figures[number])
+        return result
+
+    def range(self, low, high):
+        """Фигуры с площадью от low до high включительно по возрастанию площади"""
+        result = []
+        i = bisect_left(self._maxes, (low,))
+        if i == len(self._maxes):
+            return result
+        j = bisect_left(self._buckets[i], (low,))
+        for bucket in self._buckets[i:]:
+            stop = bisect_right(bucket, (high, float('inf')), j)
+            result.extend(self._figures[number] for _, number in bucket[j:stop])
+            if stop < len(bucket):
+                break
+            j = 0
+        return result
@@ -1,28 +1,41 @@
 import math
 
 try:
-    from lab_python_oop.figure import GeometricFigure
+    from lab_python_oop.figure import GeometricFigure, cached_metric
     from lab_python_oop.color import FigureColor
 except ImportError:
-    from figure import GeometricFigure
+    from figure import GeometricFigure, cached_metric
     from color import FigureColor
 
 class Circle(GeometricFigure):
     """Класс круга"""
 
     figure_name = "Круг"
+    __slots__ = ('_radius',)
 
-    def __init__(self, radius, color):
+    def __init__(self, radius, color, shared_color=False):
         """
         Конструктор круга
 
         Args:
             radius (float): радиус круга
             color (str): цвет круга
+            shared_color (bool): использовать разделяемый объект цвета
         """
         self.radius = radius
-        self.color_obj = FigureColor(color)
+        self._color_obj = FigureColor.for_figure(color, shared_color)
 
+    @property
+    def radius(self):
+        """Радиус круга"""
+        return self._radius
+
+    @radius.setter
+    def radius(self, value):
+        self._radius = value
+        self.invalidate()
+
+    @cached_metric
     def area(self):
         """Вычисление площади круга"""
         return math.pi * self.radius ** 2
@@ -0,0 +1,284 @@
+import math
+from array import array
+from numbers import Integral
+
+try:
+    from lab_python_oop.rectangle import Rectangle
+    from lab_python_oop.circle import Circle
+    from lab_python_oop.square import Square
+except ImportError:
+    from rectangle import Rectangle
+    from circle import Circle
+    from square import Square
+
+# numpy необязателен: без него площади считаются циклом на Python
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Коды видов фигур
+KIND_RECTANGLE = 0
+KIND_CIRCLE = 1
+KIND_SQUARE = 2
+
+# Признаки целых размеров: при обратном преобразовании размер
+# возвращается как int, а не как float
+INT_WIDTH = 1
+INT_HEIGHT = 2
+
+
+def figure_kind(figure):
+    """Код вида фигуры"""
+    # Квадрат проверяется раньше прямоугольника, так как наследуется от него
+    if isinstance(figure, Square):
+        return KIND_SQUARE
+    if isinstance(figure, Rectangle):
+        return KIND_RECTANGLE
+    if isinstance(figure, Circle):
+        return KIND_CIRCLE
+    raise TypeError(f"Неизвестный вид фигуры: {type(figure).__name__}")
+
+
+def dimension_flags(width, height):
+    """
+    Признаки целых размеров для хранения в float64
+
+    Целые, которые float64 не хранит точно (по модулю больше 2**53),
+    вызывают ValueError.
+    """
+    flags = 0
+    for value, flag in ((width, INT_WIDTH), (height, INT_HEIGHT)):
+        if isinstance(value, Integral):
+            if float(value) != value:
+                raise ValueError(f"Размер {value} нельзя сохранить в float64 без потерь")
+            flags |= flag
+    return flags
+
+
+def make_figure(kind, width, height, color, flags=0):
+    """Объект фигуры по коду вида, размерам, цвету и признакам целых размеров"""
+    if flags & INT_WIDTH:
+        width = int(width)
+    if flags & INT_HEIGHT:
+        height = int(height)
+    if kind == KIND_CIRCLE:
+        return Circle(width, color)
+    if kind == KIND_SQUARE:
+        return Square(width, color)
+    if kind == KIND_RECTANGLE:
+        return Rectangle(width, height, color)
+    raise ValueError(f"Неизвестный код вида фигуры: {kind}")
+
+
+class FigureCollection:
+    """
+    Коллекция фигур в параллельных типизированных массивах
+
+    Для каждой фигуры хранятся код вида, два размера (ширина и высота
+    прямоугольника, сторона квадрата дважды, радиус круга дважды) в виде
+    float64, признаки целых размеров и номер цвета в общей палитре.
+    Обратное преобразование возвращает размеры того же типа и значения,
+    что были у исходных фигур.
+    """
+
+    def __init__(self):
+        self.kinds = array('B')
+        self.flags = array('B')
+        self.widths = array('d')
+        self.heights = array('d')
+        self.color_ids = array('I')
+        self.palette = []
+        self._color_index = {}
+
+    @classmethod
+    def from_figures(cls, figures):
+        """Создает коллекцию из объектов Rectangle, Circle и Square"""
+        collection = cls()
+        collection.extend(figures)
+        return collection
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def color_id(self, color):
+        """Номер цвета в палитре (цвет добавляется при первом обращении)"""
+        color_id = self._color_index.get(color)
+        if color_id is None:
+            color_id = self._color_index[color] = len(self.palette)
+            self.palette.append(color)
+        return color_id
+
+    def add(self, kind, width, height, color):
+        """
+        Добавляет фигуру по коду вида, размерам и цвету
+
+        Для квадрата и круга оба размера — сторона или радиус — должны совпадать.
+        """
+        if kind not in (KIND_RECTANGLE, KIND_CIRCLE, KIND_SQUARE):
+            raise ValueError(f"Неизвестный код вида фигуры: {kind}")
+        if kind != KIND_RECTANGLE and width != height:
+            raise ValueError(f"Размеры квадрата и круга должны совпадать: {width} и {height}")
+        flags = dimension_flags(width, height)
+        self.kinds.append(kind)
+        self.flags.append(flags)
+        self.widths.append(width)
+        self.heights.append(height)
+        self.color_ids.append(self.color_id(color))
+
+    def append(self, figure):
+        """Добавляет объект фигуры"""
+        kind = figure_kind(figure)
+        if kind == KIND_CIRCLE:
+            width = height = figure.radius
+        else:
+            width, height = figure.width, figure.height
+        self.add(kind, width, height, figure.color)
+
+    def extend(self, figures):
+        """Добавляет несколько объектов фигур"""
+        for figure in figures:
+            self.append(figure)
+
+    def figure(self, index):
+        """Объект фигуры по номеру"""
+        return make_figure(self.kinds[index], self.widths[index], self.heights[index],
+                           self.palette[self.color_ids[index]], self.flags[index])
+
+    def __getitem__(self, index):
+        return self.figure(index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.figure(index)
+
+    def to_figures(self):
+        """Список объектов Rectangle, Circle и Square"""
+        return list(self)
+
+    def areas(self):
+        """
+        Площади всех фигур за один проход
+
+        Возвращает массив numpy, если он установлен, иначе array('d').
+        """
+        return _areas(self, None)
+
+    def total_area(self):
+        """Суммарная площадь фигур"""
+        return float(sum(self.areas()))
+
+    def select(self, kind=None, color=None):
+        """
+        Представление фигур заданного вида и (или) цвета
+
+        Столбцы не копируются: FigureView хранит только номера выбранных
+        фигур. Копию в виде новой коллекции дает FigureView.to_collection().
+        """
+        color_id = self._color_index.get(color)
+        if color is not None and color_id is None:
+            return FigureView(self, array('q'))
+
+        if np is not None:
+            mask = np.ones(len(self), dtype=bool)
+            if kind is not None:
+                mask &= np.frombuffer(self.kinds, dtype=np.uint8) == kind
+            if color is not None:
+                mask &= np.frombuffer(self.color_ids, dtype=np.uint32) == color_id
+            positions = array('q', np.flatnonzero(mask).astype(np.int64).tobytes())
+            return FigureView(self, positions)
+
+        return FigureView(self, array('q', (
+            index for index in range(len(self))
+            if (kind is None or self.kinds[index] == kind)
+            and (color is None or self.color_ids[index] == color_id))))
+
+
+# Столбцы коллекции в порядке хранения
+COLUMNS = ('kinds', 'flags', 'widths', 'heights', 'color_ids')
+
+
+def _areas(collection, positions):
+    """Площади фигур коллекции (всех или с номерами positions)"""
+    if np is not None:
+        columns = [np.frombuffer(getattr(collection, name), dtype=typecode)
+                   for name, typecode in (('kinds', np.uint8), ('widths', np.float64),
+                                          ('heights', np.float64))]
+        if positions is not None:
+            index = np.frombuffer(positions, dtype=np.int64)
+            columns = [column[index] for column in columns]
+        kinds, widths, heights = columns
+        areas = widths * heights
+        areas[kinds == KIND_CIRCLE] *= math.pi
+        return areas
+
+    kinds, widths, heights = collection.kinds, collection.widths, collection.heights
+    if positions is None:
+        areas = array('d', map(float.__mul__, widths, heights))
+    else:
+        areas = array('d', (widths[index] * heights[index] for index in positions))
+        kinds = [kinds[index] for index in positions]
+    for offset, kind in enumerate(kinds):
+        if kind == KIND_CIRCLE:
+            areas[offset] *= math.pi
+    return areas
+
+
+class FigureView:
+    """
+    Отфильтрованное представление коллекции FigureCollection
+
+    Хранит ссылку на коллекцию и номера выбранных фигур в array('q');
+    данные фигур читаются из столбцов коллекции. Фигуры, добавленные
+    в коллекцию после выборки, в представление не попадают.
+    """
+
+    def __init__(self, collection, positions):
+        self.collection = collection
+        self.positions = positions
+
+    def __len__(self):
+        return len(self.positions)
+
+    def figure(self, index):
+        """Объект фигуры по номеру в представлении"""
+        return self.collection.figure(self.positions[index])
+
+    def __getitem__(self, index):
+        return self.figure(index)
+
+    def __iter__(self):
+        for position in self.positions:
+            yield self.collection.figure(position)
+
+    def to_figures(self):
+        """Список объектов Rectangle, Circle и Square"""
+        return list(self)
+
+    def areas(self):
+        """Площади выбранных фигур (массив numpy или array('d'))"""
+        return _areas(self.collection, self.positions)
+
+    def total_area(self):
+        """Суммарная площадь выбранных фигур"""
+        return float(sum(self.areas()))
+
+    def to_collection(self):
+        """
+        Копия выбранных фигур в виде новой коллекции
+
+        Палитра копируется целиком, поэтому номера цветов совпадают.
+        """
+        collection = self.collection
+        selection = FigureCollection()
+        selection.palette = list(collection.palette)
+        selection._color_index = dict(collection._color_index)
+        for name in COLUMNS:
+            column = getattr(collection, name)
+            if np is not None:
+                values = np.frombuffer(column, dtype=column.typecode)[
+                    np.frombuffer(self.positions, dtype=np.int64)]
+                getattr(selection, name).frombytes(values.tobytes())
+            else:
+                getattr(selection, name).extend(column[index] for index in self.positions)
+        return selection
@@ -1,8 +1,27 @@
 class FigureColor:
     """Класс для хранения цвета фигуры"""
 
-    def __init__(self, color):
+    __slots__ = ('_color', '_shared')
+
+    # Разделяемые (интернированные) цвета по названию
+    _registry = {}
+
+    def __init__(self, color, shared=False):
         self._color = color
+        self._shared = shared
+
+    @classmethod
+    def intern(cls, color):
+        """Разделяемый неизменяемый объект цвета с данным названием"""
+        color_obj = cls._registry.get(color)
+        if color_obj is None:
+            color_obj = cls._registry[color] = cls(color, shared=True)
+        return color_obj
+
+    @classmethod
+    def for_figure(cls, color, shared=False):
+        """Объект цвета для фигуры: разделяемый при shared=True, иначе собственный"""
+        return cls.intern(color) if shared else cls(color)
 
     @property
     def color(self):
@@ -12,4 +31,31 @@ class FigureColor:
     @color.setter
     def color(self, value):
         """Свойство для установки цвета"""
+        if self._shared:
+            raise AttributeError(
+                "Разделяемый цвет нельзя изменить, присвойте новый цвет фигуре (figure.color)")
         self._color = value
+
+
+class SharedColorRef:
+    """
+    Цвет фигуры с разделяемым цветом, возвращаемый figure.color_obj
+
+    Изменение color не трогает общий объект, а заменяет цвет фигуры
+    на разделяемый цвет с новым названием.
+    """
+
+    __slots__ = ('_figure',)
+
+    def __init__(self, figure):
+        self._figure = figure
+
+    @property
+    def color(self):
+        """Свойство для получения цвета"""
+        return self._figure._color_obj.color
+
+    @color.setter
+    def color(self, value):
+        """Свойство для установки цвета"""
+        self._figure._color_obj = FigureColor.intern(value)
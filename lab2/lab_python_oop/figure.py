@@ -1,8 +1,93 @@
 from abc import ABC, abstractmethod
+from functools import wraps
+from weakref import WeakKeyDictionary, WeakSet
+
+try:
+    from lab_python_oop.color import FigureColor, SharedColorRef
+except ImportError:
+    from color import FigureColor, SharedColorRef
+
+
+# Значение незаполненного слота производной величины
+_MISSING = object()
+
+
+def cached_metric(method):
+    """
+    Декоратор производной величины фигуры (площади и т.п.)
+
+    Значение метода name хранится в слоте _name экземпляра и пересчитывается
+    только после изменения размеров фигуры. Слот объявляется в __slots__
+    и перечисляется в _metric_slots класса.
+    """
+    slot = '_' + method.__name__
+
+    @wraps(method)
+    def wrapper(self):
+        stats = GeometricFigure._cache_stats
+        value = getattr(self, slot, _MISSING)
+        if value is not _MISSING:
+            stats['hits'] += 1
+            return value
+        stats['misses'] += 1
+        value = method(self)
+        setattr(self, slot, value)
+        return value
+
+    return wrapper
+
 
 class GeometricFigure(ABC):
     """Абстрактный класс геометрической фигуры"""
 
+    __slots__ = ('_area', '_color_obj', '__weakref__')
+
+    # Слоты производных величин (см. cached_metric)
+    _metric_slots = ('_area',)
+    # Общая статистика обращений к кэшу производных величин
+    _cache_stats = {'hits': 0, 'misses': 0}
+    # Подписчики на изменение размеров: фигура -> множество объектов
+    # с методом figure_changed(figure). Ссылки на фигуры и подписчиков
+    # слабые, поэтому подписка не удерживает их в памяти.
+    _observers = WeakKeyDictionary()
+
+    def invalidate(self):
+        """
+        Сбрасывает кэш производных величин (вызывается при смене размеров)
+
+        Подписчики фигуры получают вызов figure_changed(figure).
+        """
+        for slot in self._metric_slots:
+            setattr(self, slot, _MISSING)
+        if GeometricFigure._observers:
+            for observer in list(GeometricFigure._observers.get(self, ())):
+                observer.figure_changed(self)
+
+    def subscribe(self, observer):
+        """Подписывает observer на изменение размеров фигуры"""
+        GeometricFigure._observers.setdefault(self, WeakSet()).add(observer)
+
+    def unsubscribe(self, observer):
+        """Отменяет подписку observer"""
+        observers = GeometricFigure._observers[self]
+        observers.remove(observer)
+        if not observers:
+            del GeometricFigure._observers[self]
+
+    @classmethod
+    def cache_info(cls):
+        """Количество попаданий и промахов кэша и доля попаданий"""
+        hits = cls._cache_stats['hits']
+        misses = cls._cache_stats['misses']
+        total = hits + misses
+        return {'hits': hits, 'misses': misses, 'hit_rate': hits / total if total else 0.0}
+
+    @classmethod
+    def reset_cache_info(cls):
+        """Обнуляет статистику кэша"""
+        cls._cache_stats['hits'] = 0
+        cls._cache_stats['misses'] = 0
+
     @abstractmethod
     def area(self):
         """Абстрактный метод для вычисления площади"""
@@ -12,6 +97,33 @@ class GeometricFigure(ABC):
         """Возвращает название фигуры"""
         return self.figure_name if hasattr(self, 'figure_name') else self.__class__.__name__
 
+    @property
+    def color_obj(self):
+        """
+        Объект цвета фигуры
+
+        Для разделяемого цвета возвращается SharedColorRef, поэтому
+        присваивание color_obj.color меняет цвет только этой фигуры.
+        """
+        color_obj = self._color_obj
+        return SharedColorRef(self) if color_obj._shared else color_obj
+
+    @color_obj.setter
+    def color_obj(self, value):
+        if isinstance(value, SharedColorRef):
+            value = value._figure._color_obj
+        self._color_obj = value
+
+    @property
+    def color(self):
+        """Название цвета фигуры"""
+        return self._color_obj.color
+
+    @color.setter
+    def color(self, value):
+        """Смена цвета фигуры (разделяемый цвет заменяется, а не изменяется)"""
+        self._color_obj = FigureColor.for_figure(value, self._color_obj._shared)
+
     @abstractmethod
     def __repr__(self):
         pass
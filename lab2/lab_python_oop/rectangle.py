@@ -1,19 +1,20 @@
 # Убираем относительный импорт, используем прямой
 try:
     # Пытаемся импортировать из того же пакета
-    from lab_python_oop.figure import GeometricFigure
+    from lab_python_oop.figure import GeometricFigure, cached_metric
     from lab_python_oop.color import FigureColor
 except ImportError:
     # Если не работает, определяем классы локально или импортируем напрямую
-    from figure import GeometricFigure
+    from figure import GeometricFigure, cached_metric
     from color import FigureColor
 
 class Rectangle(GeometricFigure):
     """Класс прямоугольника"""
 
     figure_name = "Прямоугольник"
+    __slots__ = ('_width', '_height')
 
-    def __init__(self, width, height, color):
+    def __init__(self, width, height, color, shared_color=False):
         """
         Конструктор прямоугольника
 
@@ -21,11 +22,33 @@ class Rectangle(GeometricFigure):
             width (float): ширина прямоугольника
             height (float): высота прямоугольника
             color (str): цвет прямоугольника
+            shared_color (bool): использовать разделяемый объект цвета
         """
         self.width = width
         self.height = height
-        self.color_obj = FigureColor(color)
+        self._color_obj = FigureColor.for_figure(color, shared_color)
 
+    @property
+    def width(self):
+        """Ширина прямоугольника"""
+        return self._width
+
+    @width.setter
+    def width(self, value):
+        self._width = value
+        self.invalidate()
+
+    @property
+    def height(self):
+        """Высота прямоугольника"""
+        return self._height
+
+    @height.setter
+    def height(self, value):
+        self._height = value
+        self.invalidate()
+
+    @cached_metric
     def area(self):
         """Вычисление площади прямоугольника"""
         return self.width * self.height
@@ -0,0 +1,365 @@
+"""
+Двоичный формат хранения фигур
+
+Формат файла (little-endian):
+    заголовок: сигнатура, версия, размер записи, количество фигур,
+               размер словаря цветов в байтах;
+    записи:    по 24 байта на фигуру — код вида (1 байт), признаки целых
+               размеров (1 байт, затем 2 байта выравнивания), номер цвета
+               (uint32), два размера (float64);
+    словарь:   количество цветов и для каждого длина и байты UTF-8 названия.
+Словарь цветов записывается в конце, поэтому запись идет потоком, без
+заранее известного количества фигур. Для чтения есть потоковый
+FigureReader и MappedFigures — записи через mmap без копирования.
+Читатели отвергают записи с неизвестным кодом вида или номером цвета
+вне словаря.
+"""
+
+import mmap
+import os
+import struct
+
+try:
+    from lab_python_oop.collection import (
+        FigureCollection, dimension_flags, figure_kind, make_figure, KIND_CIRCLE, KIND_SQUARE
+    )
+except ImportError:
+    from collection import (
+        FigureCollection, dimension_flags, figure_kind, make_figure, KIND_CIRCLE, KIND_SQUARE
+    )
+
+# numpy необязателен: без него записи разбираются через struct
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MAGIC = b'FIGURES\0'
+VERSION = 1
+
+HEADER = struct.Struct('<8sIIQQ')
+RECORD = struct.Struct('<BBxxIdd')
+COLOR_LENGTH = struct.Struct('<I')
+
+# Количество записей, читаемых потоковым читателем за раз
+BLOCK_RECORDS = 65536
+# Коды видов фигур идут подряд от 0 до KIND_SQUARE
+MAX_KIND = KIND_SQUARE
+
+if np is not None:
+    RECORD_DTYPE = np.dtype({'names': ['kind', 'flags', 'color_id', 'width', 'height'],
+                             'formats': ['u1', 'u1', '<u4', '<f8', '<f8'],
+                             'offsets': [0, 1, 4, 8, 16],
+                             'itemsize': RECORD.size})
+
+
+class FigureFormatError(ValueError):
+    """Ошибка формата файла фигур"""
+
+
+class FigureWriter:
+    """
+    Потоковая запись фигур в файл
+
+    Запись идет во временный файл path + '.tmp', который заменяет path
+    только в close(). Если блок with завершился исключением, временный
+    файл удаляется, а прежний файл path не изменяется (см. abort).
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._tmp_path = path + '.tmp'
+        self._file = open(self._tmp_path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, 0, 0))
+        self.count = 0
+        self.palette = []
+        self._color_index = {}
+
+    def color_id(self, color):
+        """Номер цвета в словаре файла"""
+        color_id = self._color_index.get(color)
+        if color_id is None:
+            color_id = self._color_index[color] = len(self.palette)
+            self.palette.append(color)
+        return color_id
+
+    def write_record(self, kind, width, height, color):
+        """Записывает фигуру по коду вида, размерам и цвету"""
+        self._file.write(RECORD.pack(kind, dimension_flags(width, height),
+                                     self.color_id(color), width, height))
+        self.count += 1
+
+    def write(self, figure):
+        """Записывает объект фигуры"""
+        kind = figure_kind(figure)
+        if kind == KIND_CIRCLE:
+            width = height = figure.radius
+        else:
+            width, height = figure.width, figure.height
+        self.write_record(kind, width, height, figure.color)
+
+    def write_collection(self, collection):
+        """Записывает всю коллекцию FigureCollection"""
+        color_ids = [self.color_id(color) for color in collection.palette]
+        if np is not None:
+            records = np.empty(len(collection), dtype=RECORD_DTYPE)
+            records['kind'] = np.frombuffer(collection.kinds, dtype=np.uint8)
+            records['flags'] = np.frombuffer(collection.flags, dtype=np.uint8)
+            records['color_id'] = np.asarray(color_ids, dtype=np.uint32)[
+                np.frombuffer(collection.color_ids, dtype=np.uint32)]
+            records['width'] = np.frombuffer(collection.widths, dtype=np.float64)
+            records['height'] = np.frombuffer(collection.heights, dtype=np.float64)
+            self._file.write(records.tobytes())
+        else:
+            pack = RECORD.pack
+            self._file.write(b''.join(
+                pack(kind, flags, color_ids[color_id], width, height)
+                for kind, flags, color_id, width, height in zip(
+                    collection.kinds, collection.flags, collection.color_ids,
+                    collection.widths, collection.heights)))
+        self.count += len(collection)
+
+    def close(self):
+        """Дописывает словарь цветов и заголовок и заменяет файл path записанным"""
+        if self._file.closed:
+            return
+        palette = bytearray(COLOR_LENGTH.pack(len(self.palette)))
+        for color in self.palette:
+            data = color.encode('utf-8')
+            palette += COLOR_LENGTH.pack(len(data))
+            palette += data
+        self._file.write(palette)
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, self.count, len(palette)))
+        self._file.close()
+        os.replace(self._tmp_path, self._path)
+
+    def abort(self):
+        """Закрывает и удаляет временный файл, не трогая файл path"""
+        if self._file.closed:
+            return
+        self._file.close()
+        os.remove(self._tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def _parse_header(data, path):
+    """Количество записей и размер словаря цветов по заголовку"""
+    if len(data) < HEADER.size:
+        raise FigureFormatError(f"Файл слишком мал для файла фигур: {path}")
+    magic, version, record_size, count, palette_size = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+        raise FigureFormatError(f"Неизвестный формат файла фигур: {path}")
+    return count, palette_size
+
+
+def _parse_palette(data, path):
+    """Список названий цветов из байтов словаря"""
+    try:
+        (size,) = COLOR_LENGTH.unpack_from(data)
+        palette = []
+        offset = COLOR_LENGTH.size
+        for _ in range(size):
+            (length,) = COLOR_LENGTH.unpack_from(data, offset)
+            offset += COLOR_LENGTH.size
+            palette.append(bytes(data[offset:offset + length]).decode('utf-8'))
+            offset += length
+    except (struct.error, UnicodeDecodeError):
+        raise FigureFormatError(f"Поврежден словарь цветов: {path}")
+    return palette
+
+
+def _check_record(kind, color_id, palette, path):
+    """Проверяет код вида и номер цвета записи"""
+    if kind > MAX_KIND:
+        raise FigureFormatError(f"Неизвестный код вида фигуры {kind}: {path}")
+    if color_id >= len(palette):
+        raise FigureFormatError(f"Номер цвета {color_id} вне словаря цветов: {path}")
+
+
+class FigureReader:
+    """Потоковое чтение фигур из файла блоками по BLOCK_RECORDS записей"""
+
+    def __init__(self, path):
+        self._path = path
+        self._file = open(path, 'rb')
+        try:
+            self.count, palette_size = _parse_header(self._file.read(HEADER.size), path)
+            self._file.seek(HEADER.size + self.count * RECORD.size)
+            data = self._file.read(palette_size)
+            if len(data) != palette_size or self._file.read(1):
+                raise FigureFormatError(f"Размер файла не соответствует заголовку: {path}")
+            self.palette = _parse_palette(data, path)
+        except Exception:
+            self._file.close()
+            raise
+
+    def records(self):
+        """Кортежи (код вида, размер 1, размер 2, цвет, признаки целых размеров)"""
+        palette = self.palette
+        colors = len(palette)
+        self._file.seek(HEADER.size)
+        remaining = self.count
+        while remaining:
+            block = min(remaining, BLOCK_RECORDS)
+            data = self._file.read(block * RECORD.size)
+            for kind, flags, color_id, width, height in RECORD.iter_unpack(data):
+                if kind > MAX_KIND or color_id >= colors:
+                    _check_record(kind, color_id, palette, self._path)
+                yield kind, width, height, palette[color_id], flags
+            remaining -= block
+
+    def __iter__(self):
+        """Объекты фигур"""
+        for record in self.records():
+            yield make_figure(*record)
+
+    def close(self):
+        """Закрывает файл"""
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class MappedFigures:
+    """
+    Файл фигур, открытый через mmap
+
+    records — memoryview области записей без копирования; если установлен
+    numpy, array — структурированный массив поверх той же памяти.
+    Перед close() ссылки на array и его поля нужно освободить.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise FigureFormatError(f"Пустой файл фигур: {path}")
+        try:
+            self.count, palette_size = _parse_header(self._map, path)
+            end = HEADER.size + self.count * RECORD.size
+            if end + palette_size != len(self._map):
+                raise FigureFormatError(f"Размер файла не соответствует заголовку: {path}")
+            view = memoryview(self._map)
+            self.records = view[HEADER.size:end]
+            self.palette = _parse_palette(view[end:], path)
+            del view
+        except Exception:
+            self.close()
+            raise
+        self.array = None
+        if np is not None:
+            self.array = np.frombuffer(self._map, dtype=RECORD_DTYPE,
+                                       count=self.count, offset=HEADER.size)
+        try:
+            self._check_records(path)
+        except FigureFormatError:
+            self.close()
+            raise
+
+    def _check_records(self, path):
+        """Проверяет коды видов и номера цветов всех записей"""
+        if not self.count:
+            return
+        if self.array is not None:
+            kind = int(self.array['kind'].max())
+            color_id = int(self.array['color_id'].max())
+            _check_record(kind, color_id, self.palette, path)
+        else:
+            for kind, _, color_id, _, _ in RECORD.iter_unpack(self.records):
+                _check_record(kind, color_id, self.palette, path)
+
+    def __len__(self):
+        return self.count
+
+    def record(self, index):
+        """Кортеж (код вида, размер 1, размер 2, цвет, признаки целых размеров) по номеру"""
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError('номер записи вне диапазона')
+        kind, flags, color_id, width, height = RECORD.unpack_from(self.records, index * RECORD.size)
+        return kind, width, height, self.palette[color_id], flags
+
+    def __getitem__(self, index):
+        return make_figure(*self.record(index))
+
+    def __iter__(self):
+        palette = self.palette
+        for kind, flags, color_id, width, height in RECORD.iter_unpack(self.records):
+            yield make_figure(kind, width, height, palette[color_id], flags)
+
+    def areas(self):
+        """Площади всех фигур (нужен numpy)"""
+        if self.array is None:
+            return self.to_collection().areas()
+        areas = self.array['width'] * self.array['height']
+        areas[self.array['kind'] == KIND_CIRCLE] *= np.pi
+        return areas
+
+    def to_collection(self):
+        """Копия данных в виде FigureCollection"""
+        collection = FigureCollection()
+        collection.palette = list(self.palette)
+        collection._color_index = {color: i for i, color in enumerate(self.palette)}
+        if self.array is not None:
+            collection.kinds.frombytes(self.array['kind'].tobytes())
+            collection.flags.frombytes(self.array['flags'].tobytes())
+            collection.color_ids.frombytes(self.array['color_id'].astype(np.uint32).tobytes())
+            collection.widths.frombytes(self.array['width'].tobytes())
+            collection.heights.frombytes(self.array['height'].tobytes())
+        else:
+            for kind, flags, color_id, width, height in RECORD.iter_unpack(self.records):
+                collection.kinds.append(kind)
+                collection.flags.append(flags)
+                collection.color_ids.append(color_id)
+                collection.widths.append(width)
+                collection.heights.append(height)
+        return collection
+
+    def close(self):
+        """Закрывает отображение и файл"""
+        self.array = None
+        if getattr(self, 'records', None) is not None:
+            self.records.release()
+            self.records = None
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def save_figures(path, figures):
+    """Записывает объекты фигур или FigureCollection в файл"""
+    with FigureWriter(path) as writer:
+        if isinstance(figures, FigureCollection):
+            writer.write_collection(figures)
+        else:
+            for figure in figures:
+                writer.write(figure)
+
+
+def load_collection(path):
+    """Читает файл в FigureCollection"""
+    with MappedFigures(path) as mapped:
+        return mapped.to_collection()
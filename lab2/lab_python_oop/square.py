@@ -7,16 +7,32 @@ class Square(Rectangle):
     """Класс квадрата, наследуется от прямоугольника"""
 
     figure_name = "Квадрат"
+    __slots__ = ()
 
-    def __init__(self, side, color):
+    def __init__(self, side, color, shared_color=False):
         """
         Конструктор квадрата
 
         Args:
             side (float): длина стороны квадрата
             color (str): цвет квадрата
+            shared_color (bool): использовать разделяемый объект цвета
         """
-        super().__init__(side, side, color)
+        super().__init__(side, side, color, shared_color)
+
+    # Ширина и высота квадрата всегда равны: изменение одной меняет другую
+
+    @property
+    def side(self):
+        """Сторона квадрата"""
+        return self._width
+
+    @side.setter
+    def side(self, value):
+        self._width = self._height = value
+        self.invalidate()
+
+    width = height = side
 
     def __repr__(self):
         """Строковое представление квадрата"""
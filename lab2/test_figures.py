@@ -0,0 +1,299 @@
+import gc
+import math
+import os
+import random
+import tempfile
+import unittest
+import weakref
+from unittest import mock
+
+from lab_python_oop import (
+    Rectangle, Circle, Square, FigureColor, FigureCollection, FigureView, AreaIndex,
+    GeometricFigure, FigureWriter, FigureReader, MappedFigures, save_figures, load_collection
+)
+from lab_python_oop import collection as collection_module
+from lab_python_oop import serialization as serialization_module
+from lab_python_oop.collection import KIND_RECTANGLE, KIND_CIRCLE, KIND_SQUARE, make_figure
+from lab_python_oop.serialization import FigureFormatError, HEADER, RECORD
+
+
+def create_test_figures():
+    """Фигуры трех видов с целыми и дробными размерами"""
+    return [
+        Rectangle(2, 3, "синий"),
+        Circle(1.5, "зеленый"),
+        Square(4, "красный"),
+        Rectangle(2.5, 1, "синий"),
+        Circle(2, "синий"),
+        Square(0.5, "зеленый"),
+    ]
+
+
+class TestFigures(unittest.TestCase):
+    """Класс для тестирования классов геометрических фигур"""
+
+    def setUp(self):
+        """Подготовка тестовых данных перед каждым тестом"""
+        self.figures = create_test_figures()
+
+    # Тест 1: Коллекция в массивах без потерь преобразуется обратно в объекты
+    def test_collection_round_trip(self):
+        """Тест совпадения типов, размеров и цветов после преобразования"""
+        collection = FigureCollection.from_figures(self.figures)
+        figures = collection.to_figures()
+        self.assertEqual([repr(f) for f in figures], [repr(f) for f in self.figures])
+        self.assertEqual([type(f) for f in figures], [type(f) for f in self.figures])
+        self.assertIs(type(figures[0].width), int)
+        self.assertIs(type(figures[3].width), float)
+        self.assertIs(type(figures[3].height), int)
+
+        for numpy_module in (collection_module.np, None):
+            with mock.patch.object(collection_module, 'np', numpy_module):
+                areas = list(collection.areas())
+                self.assertEqual(len(areas), len(self.figures))
+                for figure, area in zip(self.figures, areas):
+                    self.assertTrue(math.isclose(figure.area(), area))
+
+    # Тест 2: Проверка размеров при добавлении по коду вида
+    def test_collection_add(self):
+        """Тест отказа от квадрата и круга с разными размерами"""
+        collection = FigureCollection()
+        collection.add(KIND_SQUARE, 3, 3, "синий")
+        collection.add(KIND_RECTANGLE, 3, 4, "синий")
+        with self.assertRaises(ValueError):
+            collection.add(KIND_SQUARE, 3, 4, "синий")
+        with self.assertRaises(ValueError):
+            collection.add(KIND_CIRCLE, 1, 2, "синий")
+        with self.assertRaises(ValueError):
+            collection.add(KIND_RECTANGLE, 2 ** 53 + 1, 1, "синий")
+        with self.assertRaises(ValueError):
+            collection.add(7, 1, 1, "синий")
+        self.assertEqual(len(collection), 2)
+        self.assertEqual(repr(collection[0]), repr(Square(3, "синий")))
+
+    # Тест 3: Выборка по виду и цвету — представление без копирования
+    def test_collection_select(self):
+        """Тест представлений выборки и их копирования в коллекцию"""
+        collection = FigureCollection.from_figures(self.figures)
+        for numpy_module in (collection_module.np, None):
+            with mock.patch.object(collection_module, 'np', numpy_module):
+                blue = collection.select(color="синий")
+                self.assertIsInstance(blue, FigureView)
+                self.assertEqual(list(blue.positions), [0, 3, 4])
+                self.assertEqual([repr(f) for f in blue],
+                                 [repr(self.figures[i]) for i in (0, 3, 4)])
+                self.assertTrue(math.isclose(blue.total_area(), 6 + 2.5 + 4 * math.pi))
+
+                circles = collection.select(kind=KIND_CIRCLE, color="синий")
+                self.assertEqual(repr(circles[0]), repr(self.figures[4]))
+                self.assertEqual(len(collection.select(color="черный")), 0)
+
+                copy = blue.to_collection()
+                self.assertIsInstance(copy, FigureCollection)
+                self.assertEqual([repr(f) for f in copy], [repr(f) for f in blue])
+
+        # Представление читает данные коллекции, а копия — нет
+        collection.widths[0] = 10
+        self.assertEqual(blue[0].width, 10)
+        self.assertEqual(copy[0].width, 2)
+
+    # Тест 4: Разделяемые цвета задаются при создании фигуры
+    def test_shared_colors(self):
+        """Тест смены разделяемого и собственного цвета через color_obj.color"""
+        first = Rectangle(1, 2, "синий", shared_color=True)
+        second = Square(3, "синий", shared_color=True)
+        own = Circle(1, "синий")
+        self.assertIs(first._color_obj, second._color_obj)
+        self.assertIsNot(own._color_obj, first._color_obj)
+
+        # Меняется цвет только одной фигуры, общий объект не изменяется
+        first.color_obj.color = "красный"
+        self.assertEqual(first.color_obj.color, "красный")
+        self.assertEqual(second.color_obj.color, "синий")
+        self.assertIs(first._color_obj, FigureColor.intern("красный"))
+        first.color = "зеленый"
+        self.assertIs(first._color_obj, FigureColor.intern("зеленый"))
+        second.color_obj = first.color_obj
+        self.assertEqual(second.color, "зеленый")
+        with self.assertRaises(AttributeError):
+            FigureColor.intern("синий").color = "черный"
+
+        # Собственный цвет изменяется на месте
+        color_obj = own.color_obj
+        own.color_obj.color = "желтый"
+        self.assertIs(own.color_obj, color_obj)
+        self.assertEqual(own.color, "желтый")
+        own.color = "черный"
+        self.assertFalse(own._color_obj._shared)
+
+    # Тест 5: Индекс по площади совпадает с полным перебором
+    def test_area_index(self):
+        """Тест top, range и rank после вставок, удалений и изменения размеров"""
+        rnd = random.Random(0)
+        figures = [rnd.choice([Rectangle(rnd.randint(1, 30), rnd.randint(1, 30), "синий"),
+                               Circle(rnd.randint(1, 10), "синий"),
+                               Square(rnd.randint(1, 30), "синий")])
+                   for _ in range(3000)]
+        index = AreaIndex(figures[:2000])
+        present = list(figures[:2000])
+
+        for step in range(3000):
+            action = rnd.random()
+            if action < 0.2:
+                figure = figures[2000 + step % 1000]
+                if figure not in index:
+                    index.add(figure)
+                    present.append(figure)
+            elif action < 0.3 and present:
+                figure = present.pop(rnd.randrange(len(present)))
+                index.remove(figure)
+            elif present:
+                # Размеры меняются без вызова index.update
+                figure = rnd.choice(present)
+                if isinstance(figure, Circle):
+                    figure.radius = rnd.randint(1, 10)
+                elif isinstance(figure, Square):
+                    figure.side = rnd.randint(1, 30)
+                else:
+                    figure.width = rnd.randint(1, 30)
+
+        areas = sorted(figure.area() for figure in present)
+        self.assertEqual(len(index), len(present))
+        self.assertEqual([figure.area() for figure in index], areas)
+        self.assertEqual([figure.area() for figure in index.top(100)], areas[::-1][:100])
+        self.assertEqual(sorted(figure.area() for figure in index.range(100, 300)),
+                         [area for area in areas if 100 <= area <= 300])
+        for figure in present[:100]:
+            self.assertEqual(index.rank(figure), sum(area < figure.area() for area in areas))
+        self.assertEqual(index[0].area(), areas[0])
+
+        # После очистки индекс не подписан на фигуры
+        index.clear()
+        self.assertEqual(len(index), 0)
+        self.assertNotIn(present[0], GeometricFigure._observers)
+        present[0].invalidate()
+
+        # Брошенный индекс и его фигуры собираются сборщиком мусора
+        figures = [Rectangle(i, 2, "синий") for i in range(1, 10)]
+        index = AreaIndex(figures)
+        index_ref = weakref.ref(index)
+        figure_ref = weakref.ref(figures[0])
+        figures[1].width = 20
+        self.assertIs(index.top(1)[0], figures[1])
+        del index, figures
+        gc.collect()
+        self.assertIsNone(index_ref())
+        self.assertIsNone(figure_ref())
+
+    # Тест 6: Запись фигур в двоичный файл и чтение обратно
+    def test_serialization_round_trip(self):
+        """Тест чтения файла потоком, через mmap и в коллекцию"""
+        expected = [repr(f) for f in self.figures]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'figures.bin')
+            save_figures(path, self.figures)
+            with FigureReader(path) as reader:
+                self.assertEqual([repr(f) for f in reader], expected)
+            with MappedFigures(path) as mapped:
+                self.assertEqual(len(mapped), len(self.figures))
+                self.assertEqual([repr(f) for f in mapped], expected)
+                self.assertEqual(repr(mapped[-1]), expected[-1])
+                self.assertEqual(list(mapped.areas()),
+                                 list(FigureCollection.from_figures(self.figures).areas()))
+
+            # Коллекция записывается целиком и читается без потерь
+            save_figures(path, FigureCollection.from_figures(self.figures))
+            self.assertEqual([repr(f) for f in load_collection(path)], expected)
+
+            # Пустой файл фигур и файл нулевой длины
+            save_figures(path, [])
+            self.assertEqual(len(load_collection(path)), 0)
+            with FigureReader(path) as reader:
+                self.assertEqual(list(reader), [])
+            open(path, 'wb').close()
+            with self.assertRaises(FigureFormatError):
+                load_collection(path)
+            with self.assertRaises(FigureFormatError):
+                FigureReader(path)
+
+    # Тест 7: Ошибка при записи не оставляет файл без заголовка
+    def test_writer_exception(self):
+        """Тест удаления временного файла, если запись прервана исключением"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'figures.bin')
+            with self.assertRaises(TypeError):
+                with FigureWriter(path) as writer:
+                    writer.write(self.figures[0])
+                    writer.write("не фигура")
+            self.assertEqual(os.listdir(tmp_dir), [])
+
+            # Прерванная запись не портит прежний файл
+            save_figures(path, self.figures)
+            with self.assertRaises(TypeError):
+                save_figures(path, [self.figures[0], "не фигура"])
+            self.assertEqual(os.listdir(tmp_dir), ['figures.bin'])
+            self.assertEqual([repr(f) for f in load_collection(path)],
+                             [repr(f) for f in self.figures])
+
+    # Тест 8: Площадь кэшируется в слоте и пересчитывается после смены размеров
+    def test_cached_area(self):
+        """Тест сброса кэша, статистики cache_info и размеров квадрата"""
+        rectangle, circle, square = self.figures[0], self.figures[1], self.figures[2]
+        GeometricFigure.reset_cache_info()
+        self.assertEqual(rectangle.area(), 6)
+        self.assertEqual(rectangle.area(), 6)
+        self.assertEqual(GeometricFigure.cache_info(),
+                         {'hits': 1, 'misses': 1, 'hit_rate': 0.5})
+
+        rectangle.width = 5
+        self.assertEqual(rectangle.area(), 15)
+        rectangle.height = 2
+        self.assertEqual(rectangle.area(), 10)
+        circle.radius = 2
+        self.assertTrue(math.isclose(circle.area(), 4 * math.pi))
+        info = GeometricFigure.cache_info()
+        self.assertEqual((info['hits'], info['misses']), (1, 4))
+        GeometricFigure.reset_cache_info()
+        self.assertEqual(GeometricFigure.cache_info(),
+                         {'hits': 0, 'misses': 0, 'hit_rate': 0.0})
+
+        # Сторона, ширина и высота квадрата всегда совпадают
+        self.assertEqual(square.area(), 16)
+        for attribute, value in (('side', 3), ('width', 5), ('height', 2)):
+            setattr(square, attribute, value)
+            self.assertEqual((square.side, square.width, square.height), (value,) * 3)
+            self.assertEqual(square.area(), value * value)
+
+        # Кэш хранится в слоте, без словаря у экземпляра
+        self.assertFalse(hasattr(square, '__dict__'))
+        self.assertEqual(square._area, 4)
+
+    # Тест 9: Записи с неизвестным видом или цветом отвергаются при чтении
+    def test_reader_rejects_bad_records(self):
+        """Тест проверки кода вида и номера цвета в FigureReader и MappedFigures"""
+        with self.assertRaises(ValueError):
+            make_figure(7, 1, 1, "синий")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'figures.bin')
+            for offset, value in ((0, 7), (4, 3)):
+                save_figures(path, self.figures)
+                # Код вида (байт 0) или номер цвета (байты 4–7) последней записи
+                with open(path, 'r+b') as f:
+                    f.seek(HEADER.size + (len(self.figures) - 1) * RECORD.size + offset)
+                    f.write(bytes([value]))
+
+                with FigureReader(path) as reader:
+                    with self.assertRaises(FigureFormatError):
+                        list(reader)
+                for numpy_module in (serialization_module.np, None):
+                    with mock.patch.object(serialization_module, 'np', numpy_module):
+                        with self.assertRaises(FigureFormatError):
+                            MappedFigures(path)
+                        with self.assertRaises(FigureFormatError):
+                            load_collection(path)
+
+
+if __name__ == '__main__':
+
+    unittest.main(verbosity=2)